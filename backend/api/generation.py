@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from database import get_db
 from models import GenerationRequest, GenerationResponse
-from models.models import Affectation, Examen
+from models.models import Affectation, Examen, Voeu, Enseignant
 from algorithms.optimizer_v3 import SurveillanceOptimizerV3
 import logging
 
@@ -66,24 +66,13 @@ def generer_planning_v3(request: GenerationRequest, db: Session = Depends(get_db
 
         if success:
             # Calculer le nombre de surveillances uniques (comme dans le dashboard)
-            from sqlalchemy import func, distinct
-
             nb_surveillances_uniques = (
                 db.query(
-                    func.count(
-                        distinct(
-                            func.concat(
-                                Affectation.enseignant_id,
-                                "-",
-                                func.date(Examen.dateExam),
-                                "-",
-                                Examen.h_debut,
-                            )
-                        )
-                    )
+                    Affectation.enseignant_id, Examen.dateExam, Examen.h_debut
                 )
                 .join(Examen, Affectation.examen_id == Examen.id)
-                .scalar()
+                .group_by(Affectation.enseignant_id, Examen.dateExam, Examen.h_debut)
+                .count()
                 or 0
             )
 
@@ -114,8 +103,6 @@ def generer_planning_v3(request: GenerationRequest, db: Session = Depends(get_db
 @router.delete("/reinitialiser")
 def reinitialiser_planning(db: Session = Depends(get_db)):
     """Supprime toutes les affectations actuelles"""
-    from models.models import Affectation
-
     try:
         count = db.query(Affectation).delete()
         db.commit()
@@ -136,9 +123,6 @@ def verifier_contraintes(db: Session = Depends(get_db)):
     """
     Vérifie que toutes les contraintes sont respectées dans le planning actuel
     """
-    from models.models import Examen, Affectation, Voeu, Enseignant
-    from datetime import datetime, time as dt_time
-
     problemes = []
     avertissements = []
 
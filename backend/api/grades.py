@@ -6,10 +6,16 @@ from models import (
     GradeConfigUpdate, GradeConfigResponse,
     GradeConfig
 )
-from config import GRADES
+from config import GRADES_NOMS, GRADES_NB_SURVEILLANCES
 
 router = APIRouter(prefix="/grades", tags=["Grades"])
 
+# Lignes par défaut construites une seule fois au chargement du module
+_DEFAULT_GRADE_ROWS = [
+    {"grade_code": code, "grade_nom": nom, "nb_surveillances": GRADES_NB_SURVEILLANCES[code]}
+    for code, nom in GRADES_NOMS.items()
+]
+
 
 @router.get("/", response_model=List[GradeConfigResponse])
 def lister_grades(db: Session = Depends(get_db)):
@@ -18,15 +24,14 @@ def lister_grades(db: Session = Depends(get_db)):
     
     # Si aucune configuration n'existe, initialiser avec les valeurs par défaut
     if not grades:
-        for code, info in GRADES.items():
-            grade_config = GradeConfig(
-                grade_code=code,
-                grade_nom=info["nom"],
-                nb_surveillances=info["nb_surveillances"]
-            )
-            db.add(grade_config)
+        grades = [GradeConfig(**row) for row in _DEFAULT_GRADE_ROWS]
+        db.add_all(grades)
+        db.flush()
+        # Sérialiser avant le commit : les instances expirent au commit et
+        # seraient rechargées une par une (pas besoin de relire la table)
+        reponse = [GradeConfigResponse.model_validate(grade) for grade in grades]
         db.commit()
-        grades = db.query(GradeConfig).all()
+        return reponse
     
     return grades
 
@@ -63,17 +68,11 @@ def reset_grades(db: Session = Depends(get_db)):
     """Réinitialise toutes les configurations avec les valeurs par défaut"""
     
     # Supprimer toutes les configurations existantes
-    db.query(GradeConfig).delete()
+    db.query(GradeConfig).delete(synchronize_session=False)
     
-    # Recréer avec les valeurs par défaut
-    for code, info in GRADES.items():
-        grade_config = GradeConfig(
-            grade_code=code,
-            grade_nom=info["nom"],
-            nb_surveillances=info["nb_surveillances"]
-        )
-        db.add(grade_config)
+    # Recréer avec les valeurs par défaut (un seul INSERT multi-lignes)
+    db.bulk_insert_mappings(GradeConfig, _DEFAULT_GRADE_ROWS)
     
     db.commit()
     
-    return {"success": True, "message": f"{len(GRADES)} grades réinitialisés"}
+    return {"success": True, "message": f"{len(_DEFAULT_GRADE_ROWS)} grades réinitialisés"}
@@ -1,33 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks, Request
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from database import get_db
 from services import ImportService
-from config import UPLOAD_DIR
+from config import UPLOAD_DIR, UPLOAD_CHUNK_SIZE, MAX_UPLOAD_SIZE
 import os
-import shutil
+import aiofiles
 
 router = APIRouter(prefix="/import", tags=["Import"])
 
+_EXTENSIONS_EXCEL = frozenset({".xlsx", ".xls"})
+
+
+def _valider_fichier_excel(request: Request, file: UploadFile):
+    """Rejette les fichiers non Excel ou trop volumineux avant toute écriture sur disque"""
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    if extension not in _EXTENSIONS_EXCEL:
+        raise HTTPException(status_code=400, detail="Le fichier doit être au format Excel (.xlsx ou .xls)")
+    
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Le fichier dépasse la taille maximale autorisée ({MAX_UPLOAD_SIZE // (1024 * 1024)} MB)"
+        )
+
+
+async def _sauvegarder_upload(file: UploadFile, file_path: str):
+    """Écrit le fichier uploadé sur disque par blocs sans bloquer la boucle d'événements"""
+    async with aiofiles.open(file_path, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
+
+
+def _supprimer_upload(file_path: str):
+    """Supprime le fichier temporaire s'il existe encore"""
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
 
 @router.post("/enseignants")
-async def importer_enseignants(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def importer_enseignants(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
     """Importe les enseignants depuis un fichier Excel"""
     
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Le fichier doit être au format Excel (.xlsx ou .xls)")
+    _valider_fichier_excel(request, file)
     
     # Sauvegarder temporairement le fichier
     file_path = os.path.join(UPLOAD_DIR, file.filename)
     
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await _sauvegarder_upload(file, file_path)
         
-        # Importer
-        count, erreurs = ImportService.importer_enseignants(file_path, db)
+        # Importer (lecture Excel dans le pool de threads pour ne pas bloquer la boucle d'événements)
+        count, erreurs = await run_in_threadpool(ImportService.importer_enseignants, file_path, db)
         
-        # Nettoyer
-        os.remove(file_path)
+        # Nettoyer après l'envoi de la réponse
+        background_tasks.add_task(_supprimer_upload, file_path)
         
         return {
             "success": True,
@@ -37,27 +70,29 @@ async def importer_enseignants(file: UploadFile = File(...), db: Session = Depen
         }
     
     except Exception as e:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        _supprimer_upload(file_path)
         raise HTTPException(status_code=500, detail=f"Erreur lors de l'import: {str(e)}")
 
 
 @router.post("/voeux")
-async def importer_voeux(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def importer_voeux(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
     """Importe les vœux de non-surveillance depuis un fichier Excel"""
     
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Le fichier doit être au format Excel (.xlsx ou .xls)")
+    _valider_fichier_excel(request, file)
     
     file_path = os.path.join(UPLOAD_DIR, file.filename)
     
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await _sauvegarder_upload(file, file_path)
         
-        count, erreurs = ImportService.importer_voeux(file_path, db)
+        count, erreurs = await run_in_threadpool(ImportService.importer_voeux, file_path, db)
         
-        os.remove(file_path)
+        background_tasks.add_task(_supprimer_upload, file_path)
         
         return {
             "success": True,
@@ -67,27 +102,29 @@ async def importer_voeux(file: UploadFile = File(...), db: Session = Depends(get
         }
     
     except Exception as e:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        _supprimer_upload(file_path)
         raise HTTPException(status_code=500, detail=f"Erreur lors de l'import: {str(e)}")
 
 
 @router.post("/examens")
-async def importer_examens(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def importer_examens(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
     """Importe les examens depuis un fichier Excel"""
     
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Le fichier doit être au format Excel (.xlsx ou .xls)")
+    _valider_fichier_excel(request, file)
     
     file_path = os.path.join(UPLOAD_DIR, file.filename)
     
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await _sauvegarder_upload(file, file_path)
         
-        count, erreurs, nb_doublons = ImportService.importer_examens(file_path, db)
+        count, erreurs, nb_doublons = await run_in_threadpool(ImportService.importer_examens, file_path, db)
         
-        os.remove(file_path)
+        background_tasks.add_task(_supprimer_upload, file_path)
         
         # Construire le message avec info sur les doublons
         message = f"{count} examens importés avec succès"
@@ -103,6 +140,5 @@ async def importer_examens(file: UploadFile = File(...), db: Session = Depends(g
         }
     
     except Exception as e:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        _supprimer_upload(file_path)
         raise HTTPException(status_code=500, detail=f"Erreur lors de l'import: {str(e)}")
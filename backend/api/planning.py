@@ -1,4 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert, delete, func, distinct, Boolean, and_
 from sqlalchemy.orm import Session, joinedload
 from database import get_db
 from models.models import Enseignant, Affectation, Examen, GradeConfig
@@ -14,7 +16,100 @@ from datetime import datetime
 router = APIRouter(prefix="/planning", tags=["Planning"])
 
 
-@router.get("/emploi-enseignant/{enseignant_id}")
+def _existe_affectation(db: Session, enseignant_id: int, seance_examen_ids):
+    """Clause EXISTS : l'enseignant a au moins une affectation parmi les examens de la séance"""
+    return db.query(Affectation.id).filter(
+        Affectation.enseignant_id == enseignant_id,
+        Affectation.examen_id.in_(seance_examen_ids)
+    ).exists()
+
+
+def _affecter_enseignant_seance(
+    db: Session,
+    enseignant_id: int,
+    filtre_seance: tuple,
+    detail_aucun_examen: str
+) -> AffectationOperationResponse:
+    """
+    Affecte un enseignant à tous les examens correspondant au filtre de séance.
+    Logique commune aux deux routes d'ajout (séance complète ou date + heure de début).
+    """
+    # Un seul aller-retour : l'enseignant, les examens de la séance (jointure externe)
+    # et l'indicateur d'affectation existante (EXISTS sur la sous-requête de la séance)
+    lignes = (
+        db.query(
+            Enseignant,
+            Examen,
+            _existe_affectation(db, enseignant_id, db.query(Examen.id).filter(*filtre_seance)).label("deja_affecte")
+        )
+        .outerjoin(Examen, and_(*filtre_seance))
+        .filter(Enseignant.id == enseignant_id)
+        .all()
+    )
+    
+    # Vérifier que l'enseignant existe
+    if not lignes:
+        raise HTTPException(status_code=404, detail=f"Enseignant avec ID {enseignant_id} introuvable")
+    enseignant, _, deja_affecte = lignes[0]
+    
+    # Vérifier que l'enseignant participe aux surveillances
+    if not enseignant.participe_surveillance:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"L'enseignant {enseignant.nom} {enseignant.prenom} ne participe pas aux surveillances"
+        )
+    
+    # Examens de la séance (aucun si la jointure externe n'a rien trouvé)
+    examens_seance = [examen for _, examen, _ in lignes if examen is not None]
+    
+    if not examens_seance:
+        raise HTTPException(
+            status_code=404,
+            detail=detail_aucun_examen
+        )
+    
+    # Vérifier si l'enseignant est déjà affecté à cette séance
+    if deja_affecte:
+        raise HTTPException(
+            status_code=400,
+            detail=f"L'enseignant {enseignant.nom} {enseignant.prenom} est déjà affecté à cette séance"
+        )
+    
+    # Vérifier si l'enseignant est responsable d'un examen dans cette séance
+    # On compare le code_smartex de l'enseignant avec le champ 'enseignant' des examens de la séance
+    # (le champ 'enseignant' contient le code_smartex du responsable de l'examen)
+    doit_etre_responsable = any(
+        examen.enseignant == enseignant.code_smartex for examen in examens_seance
+    )
+    
+    # Ajouter l'enseignant à tous les examens de la séance
+    # (un seul INSERT multi-lignes, sans instancier d'objets ORM)
+    valeurs = [
+        {
+            "examen_id": examen.id,
+            "enseignant_id": enseignant_id,
+            "cod_salle": examen.cod_salle,
+            "est_responsable": doit_etre_responsable
+        }
+        for examen in examens_seance
+    ]
+    db.execute(insert(Affectation), valeurs)
+    nb_affectations = len(valeurs)
+    
+    db.commit()
+    
+    # Message simple
+    message = f"Enseignant {enseignant.nom} {enseignant.prenom} ajouté avec succès"
+    
+    return AffectationOperationResponse(
+        success=True,
+        message=message,
+        nb_affectations_modifiees=nb_affectations,
+        est_responsable=doit_etre_responsable
+    )
+
+
+@router.get("/emploi-enseignant/{enseignant_id}", response_class=ORJSONResponse)
 def emploi_enseignant(enseignant_id: int, db: Session = Depends(get_db)):
     """
     Retourne l'emploi du temps de surveillance d'un enseignant (toutes ses séances de surveillance)
@@ -24,44 +119,41 @@ def emploi_enseignant(enseignant_id: int, db: Session = Depends(get_db)):
     if not enseignant:
         raise HTTPException(status_code=404, detail="Enseignant introuvable")
 
-    affectations = (
-        db.query(Affectation)
-        .options(joinedload(Affectation.examen))
+    # Regrouper par séance (date + h_debut + h_fin + session + semestre) directement en SQL :
+    # une séance est responsable si au moins une de ses affectations l'est (MAX sur le booléen)
+    # et les salles distinctes sont concaténées par GROUP_CONCAT
+    seances = (
+        db.query(
+            Examen.dateExam,
+            Examen.h_debut,
+            Examen.h_fin,
+            Examen.session,
+            Examen.semestre,
+            func.min(Examen.type_ex),
+            func.max(Affectation.est_responsable, type_=Boolean),
+            func.group_concat(distinct(Affectation.cod_salle)),
+        )
+        .join(Affectation, Affectation.examen_id == Examen.id)
         .filter(Affectation.enseignant_id == enseignant_id)
+        .group_by(Examen.dateExam, Examen.h_debut, Examen.h_fin, Examen.session, Examen.semestre)
+        .order_by(Examen.dateExam, Examen.h_debut)
         .all()
     )
 
-    # Regrouper par séance (date + h_debut + h_fin + session + semestre)
-    seances = {}
-    for aff in affectations:
-        ex = aff.examen
-        key = (ex.dateExam, ex.h_debut, ex.h_fin, ex.session, ex.semestre)
-
-        if key not in seances:
-            seances[key] = {
-                "date": ex.dateExam,
-                "h_debut": ex.h_debut,
-                "h_fin": ex.h_fin,
-                "session": ex.session,
-                "semestre": ex.semestre,
-                "type": ex.type_ex,
-                "est_responsable": aff.est_responsable,
-                "salles": [],
-            }
-
-        # Ajouter la salle à la liste (optionnel, pour info)
-        seances[key]["salles"].append(aff.cod_salle)
-
-        # Si une affectation est responsable, marquer toute la séance comme responsable
-        if aff.est_responsable:
-            seances[key]["est_responsable"] = True
-
-    # Convertir en liste
-    result = []
-    for key, seance in seances.items():
-        # Joindre les salles pour information (optionnel)
-        seance["salles"] = ", ".join(sorted(set(seance["salles"])))
-        result.append(seance)
+    result = [
+        {
+            "date": date,
+            "h_debut": h_debut,
+            "h_fin": h_fin,
+            "session": session,
+            "semestre": semestre,
+            "type": type_ex,
+            "est_responsable": est_responsable,
+            # Joindre les salles pour information (optionnel)
+            "salles": ", ".join(sorted(salles.split(","))) if salles else "",
+        }
+        for date, h_debut, h_fin, session, semestre, type_ex, est_responsable, salles in seances
+    ]
 
     # Récupérer la configuration du grade pour calculer le pourcentage de quota
     grade_config = (
@@ -75,7 +167,7 @@ def emploi_enseignant(enseignant_id: int, db: Session = Depends(get_db)):
         round((nb_surveillances_affectees / quota_max * 100), 2) if quota_max > 0 else 0
     )
 
-    return {
+    return ORJSONResponse({
         "enseignant": {
             "id": enseignant.id,
             "nom": enseignant.nom,
@@ -86,40 +178,72 @@ def emploi_enseignant(enseignant_id: int, db: Session = Depends(get_db)):
             "pourcentage_quota": pourcentage_quota,
         },
         "emplois": result,
-    }
+    })
 
 
-@router.get("/emploi-seances")
-def emploi_seances(db: Session = Depends(get_db)):
+@router.get("/emploi-seances", response_class=ORJSONResponse)
+def emploi_seances(details: bool = True, db: Session = Depends(get_db)):
     """
     Retourne, pour chaque séance (date + h_debut + h_fin + session + semestre), le nombre d'enseignants UNIQUES affectés
     ainsi que la liste détaillée des enseignants
+    
+    Avec details=false, seuls les compteurs sont renvoyés (calculés par GROUP BY, sans charger les affectations)
     """
+    if not details:
+        cle_seance = (Examen.dateExam, Examen.h_debut, Examen.h_fin, Examen.session, Examen.semestre)
+        compteurs = (
+            db.query(
+                *cle_seance,
+                func.count(distinct(Examen.id)),
+                func.count(distinct(Affectation.enseignant_id)),
+            )
+            .outerjoin(Affectation, Affectation.examen_id == Examen.id)
+            .group_by(*cle_seance)
+            .all()
+        )
+        return ORJSONResponse([
+            {
+                "date": date,
+                "h_debut": h_debut,
+                "h_fin": h_fin,
+                "session": session,
+                "semestre": semestre,
+                "nb_examens": nb_examens,
+                "nb_enseignants": nb_enseignants,
+            }
+            for date, h_debut, h_fin, session, semestre, nb_examens, nb_enseignants in compteurs
+        ])
+
     examens = db.query(Examen).all()
     seances = {}
+    # Séance de chaque examen, indexée par l'id entier de l'examen : le tuple de
+    # la séance n'est construit qu'une fois par examen et plus par affectation
+    seance_par_examen = {}
     for ex in examens:
         key = (ex.dateExam, ex.h_debut, ex.h_fin, ex.session, ex.semestre)
-        if key not in seances:
-            seances[key] = {"examens": [], "enseignants": {}}
-        seances[key]["examens"].append(
+        seance = seances.setdefault(key, {"examens": [], "enseignants": {}})
+        seance["examens"].append(
             {"id": ex.id, "salle": ex.cod_salle, "type": ex.type_ex}
         )
+        seance_par_examen[ex.id] = seance
 
     # Récupérer les enseignants UNIQUES affectés par séance avec leurs informations
+    # (l'examen n'est plus chargé : son id suffit pour retrouver la séance)
     affectations = (
         db.query(Affectation)
-        .options(joinedload(Affectation.examen), joinedload(Affectation.enseignant))
-        .all()
+        .options(joinedload(Affectation.enseignant))
+        .yield_per(500)
     )
 
     for aff in affectations:
-        ex = aff.examen
-        key = (ex.dateExam, ex.h_debut, ex.h_fin, ex.session, ex.semestre)
-        if key in seances:
+        seance = seance_par_examen.get(aff.examen_id)
+        if seance is not None:
             # Utiliser un dictionnaire pour éviter les doublons d'enseignants
             # et garder l'information si l'enseignant est responsable
-            if aff.enseignant_id not in seances[key]["enseignants"]:
-                seances[key]["enseignants"][aff.enseignant_id] = {
+            enseignants = seance["enseignants"]
+            info = enseignants.get(aff.enseignant_id)
+            if info is None:
+                enseignants[aff.enseignant_id] = {
                     "id": aff.enseignant_id,
                     "nom": aff.enseignant.nom,
                     "prenom": aff.enseignant.prenom,
@@ -127,7 +251,7 @@ def emploi_seances(db: Session = Depends(get_db)):
                 }
             elif aff.est_responsable:
                 # Si l'enseignant existe déjà mais cette affectation est responsable, mettre à jour
-                seances[key]["enseignants"][aff.enseignant_id]["est_responsable"] = True
+                info["est_responsable"] = True
 
     # Mise en forme
     result = []
@@ -148,7 +272,8 @@ def emploi_seances(db: Session = Depends(get_db)):
                 "enseignants": enseignants_list,
             }
         )
-    return result
+    # Sérialisation directe par orjson (pas de passage par jsonable_encoder)
+    return ORJSONResponse(result)
 
 
 @router.post("/ajouter-enseignant-seance", response_model=AffectationOperationResponse)
@@ -160,78 +285,16 @@ def ajouter_enseignant_seance(
     Ajoute un enseignant à une séance spécifique.
     L'enseignant sera affecté à tous les examens de cette séance.
     """
-    # Vérifier que l'enseignant existe
-    enseignant = db.query(Enseignant).filter(Enseignant.id == request.enseignant_id).first()
-    if not enseignant:
-        raise HTTPException(status_code=404, detail=f"Enseignant avec ID {request.enseignant_id} introuvable")
-    
-    # Vérifier que l'enseignant participe aux surveillances
-    if not enseignant.participe_surveillance:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"L'enseignant {enseignant.nom} {enseignant.prenom} ne participe pas aux surveillances"
-        )
-    
-    # Récupérer tous les examens de la séance
-    examens_seance = db.query(Examen).filter(
+    filtre_seance = (
         Examen.dateExam == request.date_examen,
         Examen.h_debut == request.h_debut,
         Examen.h_fin == request.h_fin,
         Examen.session == request.session,
         Examen.semestre == request.semestre
-    ).all()
-    
-    if not examens_seance:
-        raise HTTPException(
-            status_code=404,
-            detail="Aucun examen trouvé pour cette séance"
-        )
-    
-    # Vérifier si l'enseignant est déjà affecté à cette séance
-    affectations_existantes = db.query(Affectation).filter(
-        Affectation.enseignant_id == request.enseignant_id,
-        Affectation.examen_id.in_([ex.id for ex in examens_seance])
-    ).all()
-    
-    if affectations_existantes:
-        raise HTTPException(
-            status_code=400,
-            detail=f"L'enseignant {enseignant.nom} {enseignant.prenom} est déjà affecté à cette séance"
-        )
-    
-    # Vérifier si l'enseignant est responsable d'un examen dans cette séance
-    # On compare le code_smartex de l'enseignant avec le champ 'enseignant' des examens de la séance
-    # (le champ 'enseignant' contient le code_smartex du responsable de l'examen)
-    est_responsable_examen = False
-    for examen in examens_seance:
-        if examen.enseignant == enseignant.code_smartex:
-            est_responsable_examen = True
-            break
-    
-    doit_etre_responsable = est_responsable_examen
-    
-    # Ajouter l'enseignant à tous les examens de la séance
-    nb_affectations = 0
-    for examen in examens_seance:
-        affectation = Affectation(
-            examen_id=examen.id,
-            enseignant_id=request.enseignant_id,
-            cod_salle=examen.cod_salle,
-            est_responsable=doit_etre_responsable
-        )
-        db.add(affectation)
-        nb_affectations += 1
-    
-    db.commit()
-    
-    # Message simple
-    message = f"Enseignant {enseignant.nom} {enseignant.prenom} ajouté avec succès"
-    
-    return AffectationOperationResponse(
-        success=True,
-        message=message,
-        nb_affectations_modifiees=nb_affectations,
-        est_responsable=doit_etre_responsable
+    )
+    return _affecter_enseignant_seance(
+        db, request.enseignant_id, filtre_seance,
+        "Aucun examen trouvé pour cette séance"
     )
 
 
@@ -249,38 +312,35 @@ def supprimer_enseignant_seance(
     if not enseignant:
         raise HTTPException(status_code=404, detail=f"Enseignant avec ID {request.enseignant_id} introuvable")
     
-    # Récupérer tous les examens de la séance
-    examens_seance = db.query(Examen).filter(
+    # Vérifier que la séance existe sans charger ses examens
+    seance_examen_ids = db.query(Examen.id).filter(
         Examen.dateExam == request.date_examen,
         Examen.h_debut == request.h_debut,
         Examen.h_fin == request.h_fin,
         Examen.session == request.session,
         Examen.semestre == request.semestre
-    ).all()
+    )
     
-    if not examens_seance:
+    if not db.query(seance_examen_ids.exists()).scalar():
         raise HTTPException(
             status_code=404,
             detail="Aucun examen trouvé pour cette séance"
         )
     
-    # Récupérer toutes les affectations de cet enseignant pour cette séance
-    affectations_a_supprimer = db.query(Affectation).filter(
-        Affectation.enseignant_id == request.enseignant_id,
-        Affectation.examen_id.in_([ex.id for ex in examens_seance])
-    ).all()
+    # Supprimer toutes les affectations de cet enseignant pour cette séance (un seul DELETE)
+    nb_supprimees = db.execute(
+        delete(Affectation).where(
+            Affectation.enseignant_id == request.enseignant_id,
+            Affectation.examen_id.in_(seance_examen_ids)
+        )
+    ).rowcount
     
-    if not affectations_a_supprimer:
+    if not nb_supprimees:
         raise HTTPException(
             status_code=404,
             detail=f"L'enseignant {enseignant.nom} {enseignant.prenom} n'est pas affecté à cette séance"
         )
     
-    # Supprimer les affectations
-    nb_supprimees = len(affectations_a_supprimer)
-    for affectation in affectations_a_supprimer:
-        db.delete(affectation)
-    
     db.commit()
     
     return AffectationOperationResponse(
@@ -300,78 +360,12 @@ def ajouter_enseignant_par_date_heure(
     Le backend recherchera automatiquement tous les examens correspondants et affectera l'enseignant.
     L'enseignant sera automatiquement marqué comme responsable s'il est responsable d'un examen dans cette séance.
     """
-    # Vérifier que l'enseignant existe
-    enseignant = db.query(Enseignant).filter(Enseignant.id == request.enseignant_id).first()
-    if not enseignant:
-        raise HTTPException(status_code=404, detail=f"Enseignant avec ID {request.enseignant_id} introuvable")
-    
-    # Vérifier que l'enseignant participe aux surveillances
-    if not enseignant.participe_surveillance:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"L'enseignant {enseignant.nom} {enseignant.prenom} ne participe pas aux surveillances"
-        )
-    
-    # Récupérer tous les examens qui correspondent à cette date et heure de début
-    examens_seance = db.query(Examen).filter(
+    # Tous les examens qui correspondent à cette date et heure de début
+    filtre_seance = (
         Examen.dateExam == request.date_examen,
         Examen.h_debut == request.h_debut
-    ).all()
-    
-    if not examens_seance:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Aucun examen trouvé pour la date {request.date_examen} à {request.h_debut}"
-        )
-    
-    # Extraire les informations de la séance (on prend le premier examen comme référence)
-    premier_examen = examens_seance[0]
-    h_fin = premier_examen.h_fin
-    session = premier_examen.session
-    semestre = premier_examen.semestre
-    
-    # Vérifier si l'enseignant est déjà affecté à cette séance
-    affectations_existantes = db.query(Affectation).filter(
-        Affectation.enseignant_id == request.enseignant_id,
-        Affectation.examen_id.in_([ex.id for ex in examens_seance])
-    ).all()
-    
-    if affectations_existantes:
-        raise HTTPException(
-            status_code=400,
-            detail=f"L'enseignant {enseignant.nom} {enseignant.prenom} est déjà affecté à cette séance"
-        )
-    
-    # Vérifier si l'enseignant est responsable d'un examen dans cette séance
-    # On compare le code_smartex de l'enseignant avec le champ 'enseignant' des examens de la séance
-    est_responsable_examen = False
-    for examen in examens_seance:
-        if examen.enseignant == enseignant.code_smartex:
-            est_responsable_examen = True
-            break
-    
-    doit_etre_responsable = est_responsable_examen
-    
-    # Ajouter l'enseignant à tous les examens de la séance
-    nb_affectations = 0
-    for examen in examens_seance:
-        affectation = Affectation(
-            examen_id=examen.id,
-            enseignant_id=request.enseignant_id,
-            cod_salle=examen.cod_salle,
-            est_responsable=doit_etre_responsable
-        )
-        db.add(affectation)
-        nb_affectations += 1
-    
-    db.commit()
-    
-    # Message simple
-    message = f"Enseignant {enseignant.nom} {enseignant.prenom} ajouté avec succès"
-    
-    return AffectationOperationResponse(
-        success=True,
-        message=message,
-        nb_affectations_modifiees=nb_affectations,
-        est_responsable=doit_etre_responsable
+    )
+    return _affecter_enseignant_seance(
+        db, request.enseignant_id, filtre_seance,
+        f"Aucun examen trouvé pour la date {request.date_examen} à {request.h_debut}"
     )
@@ -1,111 +1,124 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import func, distinct, select, case, cast, Float, lambda_stmt
 from sqlalchemy.orm import Session
 from database import get_db
+from cache import en_cache, verifier_etag
 from models import StatistiquesResponse
 from models.models import Enseignant, Examen, Affectation, Voeu
 
-router = APIRouter(prefix="/statistiques", tags=["Statistiques"])
+router = APIRouter(prefix="/statistiques", tags=["Statistiques"], dependencies=[Depends(verifier_etag)])
+
+
+def _requete_statistiques():
+    """Construit le SELECT unique des statistiques globales (compilé une seule fois via lambda_stmt)"""
+    nb_examens = select(func.count(Examen.id)).scalar_subquery()
+
+    # Examens ayant au moins une affectation (table affectations seule, sans jointure)
+    examens_couverts = select(func.count(distinct(Affectation.examen_id))).scalar_subquery()
+
+    # Tous les compteurs en un seul SELECT (sous-requêtes scalaires)
+    return select(
+        select(func.count(Enseignant.id)).scalar_subquery().label("nb_enseignants"),
+        select(func.count(Enseignant.id))
+        .where(Enseignant.participe_surveillance == True)
+        .scalar_subquery()
+        .label("nb_enseignants_actifs"),
+        nb_examens.label("nb_examens"),
+        # Calculer le nombre de salles uniques
+        select(func.count(distinct(Examen.cod_salle))).scalar_subquery().label("nb_salles"),
+        # Compter les surveillances uniques (par enseignant et séance)
+        # Une séance = même date, même heure de début
+        # (nombre de groupes enseignant/date/heure, sans construire de chaîne par ligne ;
+        # dateExam est déjà stocké au format AAAA-MM-JJ, inutile d'appeler date())
+        select(func.count())
+        .select_from(
+            select(Affectation.enseignant_id, Examen.dateExam, Examen.h_debut)
+            .join(Examen, Affectation.examen_id == Examen.id)
+            .group_by(Affectation.enseignant_id, Examen.dateExam, Examen.h_debut)
+            .subquery()
+        )
+        .scalar_subquery()
+        .label("nb_affectations"),
+        select(func.count(Voeu.id)).scalar_subquery().label("nb_voeux"),
+        # Calculer le taux de couverture
+        case(
+            (nb_examens > 0, cast(examens_couverts, Float) * 100 / nb_examens),
+            else_=0.0,
+        ).label("taux_couverture"),
+    )
 
 
 @router.get("/", response_model=StatistiquesResponse)
+@en_cache()
 def obtenir_statistiques(db: Session = Depends(get_db)):
     """Retourne les statistiques globales du système"""
-    from sqlalchemy import func, distinct
+    # Requête sans paramètre : la construction et la compilation SQL sont mises en cache
+    stats = db.execute(lambda_stmt(_requete_statistiques, enable_tracking=False)).one()
 
-    nb_enseignants = db.query(Enseignant).count()
-    nb_enseignants_actifs = (
-        db.query(Enseignant).filter(Enseignant.participe_surveillance == True).count()
+    return StatistiquesResponse(
+        nb_enseignants=stats.nb_enseignants,
+        nb_enseignants_actifs=stats.nb_enseignants_actifs,
+        nb_examens=stats.nb_examens,
+        nb_salles=stats.nb_salles or 0,
+        nb_affectations=stats.nb_affectations or 0,
+        nb_voeux=stats.nb_voeux,
+        taux_couverture=round(stats.taux_couverture or 0.0, 2),
     )
-    nb_examens = db.query(Examen).count()
 
-    # Calculer le nombre de salles uniques
-    nb_salles = db.query(func.count(func.distinct(Examen.cod_salle))).scalar() or 0
 
-    # Compter les surveillances uniques (par enseignant et séance)
-    # Une séance = même date, même heure de début
-    nb_affectations = (
-        db.query(
-            func.count(
-                distinct(
-                    func.concat(
-                        Affectation.enseignant_id,
-                        "-",
-                        func.date(Examen.dateExam),
-                        "-",
-                        Examen.h_debut,
-                    )
-                )
-            )
-        )
-        .join(Examen, Affectation.examen_id == Examen.id)
-        .scalar()
-        or 0
+def _requete_charge():
+    """Construit la requête de charge par enseignant (compilée une seule fois via lambda_stmt)"""
+    # Requête Core sur les tables : lignes positionnelles, sans objets ORM ni identity map
+    ens = Enseignant.__table__.c
+    aff = Affectation.__table__.c
+    exa = Examen.__table__.c
+
+    # Séances distinctes par enseignant (même date + même heure = 1 séance),
+    # dédoublonnées sur le tuple de colonnes plutôt que sur une chaîne concaténée
+    seances = (
+        select(aff.enseignant_id, exa.dateExam, exa.h_debut)
+        .select_from(Affectation.__table__.join(Examen.__table__, aff.examen_id == exa.id))
+        .distinct()
+        .subquery()
     )
 
-    nb_voeux = db.query(Voeu).count()
-
-    # Calculer le taux de couverture
-    if nb_examens > 0:
-        examens_couverts = db.query(Examen).join(Affectation).distinct().count()
-        taux_couverture = (examens_couverts / nb_examens) * 100
-    else:
-        taux_couverture = 0.0
-
-    return StatistiquesResponse(
-        nb_enseignants=nb_enseignants,
-        nb_enseignants_actifs=nb_enseignants_actifs,
-        nb_examens=nb_examens,
-        nb_salles=nb_salles,
-        nb_affectations=nb_affectations,
-        nb_voeux=nb_voeux,
-        taux_couverture=round(taux_couverture, 2),
+    # Table de synthèse (sous-requête) : nombre de séances par enseignant affecté
+    charge = (
+        select(
+            seances.c.enseignant_id,
+            func.count().label("nb_surveillances"),
+        )
+        .group_by(seances.c.enseignant_id)
+        .subquery()
     )
 
-
+    # Jointure externe sur la synthèse : 0 pour les enseignants sans affectation
+    return (
+        select(
+            ens.id,
+            ens.nom,
+            ens.prenom,
+            ens.grade_code,
+            func.coalesce(charge.c.nb_surveillances, 0),
+        )
+        .select_from(Enseignant.__table__.outerjoin(charge, ens.id == charge.c.enseignant_id))
+        .order_by(ens.id)
+    )
 
 
 @router.get("/charge-enseignants")
+@en_cache()
 def charge_par_enseignant(db: Session = Depends(get_db)):
     """Retourne la charge de travail par enseignant (séances uniques)"""
-    from sqlalchemy import func, distinct, case
-
-    # Compter les séances uniques par enseignant (même date + même heure = 1 séance)
-    # Utiliser CASE pour retourner 0 quand il n'y a pas d'affectations au lieu de 1
-    charges = (
-        db.query(
-            Enseignant.id,
-            Enseignant.nom,
-            Enseignant.prenom,
-            Enseignant.grade_code,
-            func.count(
-                distinct(
-                    case(
-                        (Examen.id.isnot(None), func.concat(func.date(Examen.dateExam), "-", Examen.h_debut)),
-                        else_=None
-                    )
-                )
-            ).label("nb_surveillances"),
-        )
-        .join(Affectation, Enseignant.id == Affectation.enseignant_id, isouter=True)
-        .join(Examen, Affectation.examen_id == Examen.id, isouter=True)
-        .group_by(Enseignant.id)
-        .all()
-    )
-
     return {
         "charges": [
             {
-                "enseignant_id": ens_id,
-                "nom": nom,
-                "prenom": prenom,
-                "grade": grade,
-                "nb_surveillances": nb or 0,
+                "enseignant_id": r[0],
+                "nom": r[1],
+                "prenom": r[2],
+                "grade": r[3],
+                "nb_surveillances": r[4],
             }
-            for ens_id, nom, prenom, grade, nb in charges
+            for r in db.execute(lambda_stmt(_requete_charge, enable_tracking=False)).all()
         ]
     }
-
-
-
-
-
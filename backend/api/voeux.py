@@ -1,23 +1,74 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from typing import List
-from database import get_db
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select, insert, func, lambda_stmt
+from sqlalchemy.orm import Session
+from typing import List, Final, Tuple
+from itertools import chain
+from database import get_db, SessionLocal
 from models import (
-    VoeuResponse,
-    Voeu, Affectation
+    VoeuCreate, VoeuResponse,
+    Voeu, Affectation, Enseignant
 )
+import orjson
 
 router = APIRouter(prefix="/voeux", tags=["Voeux"])
 
-# Mapping indice -> nom du jour
-JOURS_SEMAINE = {
-    0: "Lundi",
-    1: "Mardi",
-    2: "Mercredi",
-    3: "Jeudi",
-    4: "Vendredi",
-    5: "Samedi"
-}
+# Indice -> nom du jour (tuple : accès direct par indice, sans hachage)
+JOURS_SEMAINE: Final[Tuple[str, ...]] = (
+    "Lundi",
+    "Mardi",
+    "Mercredi",
+    "Jeudi",
+    "Vendredi",
+    "Samedi"
+)
+
+
+_v = Voeu.__table__.c
+_e = Enseignant.__table__.c
+
+
+def _filtrer_voeux(stmt, enseignant_id, semestre_code_libelle, session_libelle):
+    """Ajoute les filtres optionnels de la liste des vœux à une requête lambda_stmt"""
+    if enseignant_id:
+        stmt += lambda s: s.where(_v.enseignant_id == enseignant_id)
+    
+    if semestre_code_libelle:
+        stmt += lambda s: s.where(_v.semestre_code_libelle == semestre_code_libelle)
+    
+    if session_libelle:
+        stmt += lambda s: s.where(_v.session_libelle == session_libelle)
+    
+    return stmt
+
+
+def _voeu_en_dict(r):
+    """Ligne (vœu + nom/prénom de l'enseignant) -> dictionnaire de réponse"""
+    return {
+        "id": r[0],
+        "enseignant_id": r[1],
+        "code_smartex_ens": r[2],
+        "enseignant_nom": r[3],
+        "enseignant_prenom": r[4],
+        "jour": r[5],
+        "seance": r[6],
+        "semestre_code_libelle": r[7],
+        "session_libelle": r[8],
+        "date_voeu": r[9],
+        "created_at": r[10]
+    }
+
+
+def _total_voeux(db, premieres_lignes, skip, enseignant_id, semestre_code_libelle, session_libelle):
+    """Nombre total de vœux filtrés, lu dans la colonne fenêtre de la première ligne"""
+    if premieres_lignes:
+        return premieres_lignes[0][11]
+    if skip > 0:
+        # Page vide au-delà de la fin : la fenêtre n'a rien renvoyé, compter à part
+        stmt_total = lambda_stmt(lambda: select(func.count()).select_from(Voeu.__table__))
+        stmt_total = _filtrer_voeux(stmt_total, enseignant_id, semestre_code_libelle, session_libelle)
+        return db.execute(stmt_total).scalar()
+    return 0
 
 
 @router.get("/", response_model=List[VoeuResponse])
@@ -29,43 +80,114 @@ def lister_voeux(
     session_libelle: str = None,
     db: Session = Depends(get_db)
 ):
-    """Liste tous les vœux avec filtres optionnels"""
-    query = db.query(Voeu).options(joinedload(Voeu.enseignant))
-    
-    if enseignant_id:
-        query = query.filter(Voeu.enseignant_id == enseignant_id)
-    
-    if semestre_code_libelle:
-        query = query.filter(Voeu.semestre_code_libelle == semestre_code_libelle)
-    
-    if session_libelle:
-        query = query.filter(Voeu.session_libelle == session_libelle)
+    """
+    Liste tous les vœux avec filtres optionnels
+    Le nombre total de vœux (avant pagination) est renvoyé dans l'en-tête X-Total-Count
+    """
+    # Requête Core : colonnes du vœu + nom/prénom de l'enseignant, sans objets ORM
+    # (lambda_stmt : construction et compilation mises en cache, filtres passés en paramètres liés)
+    stmt = lambda_stmt(lambda: select(
+        _v.id,
+        _v.enseignant_id,
+        _v.code_smartex_ens,
+        _e.nom,
+        _e.prenom,
+        _v.jour,
+        _v.seance,
+        _v.semestre_code_libelle,
+        _v.session_libelle,
+        _v.date_voeu,
+        _v.created_at,
+        # Total des lignes filtrées, calculé dans le même parcours (fenêtre avant LIMIT/OFFSET)
+        func.count().over().label("total"),
+    ).select_from(
+        Voeu.__table__.outerjoin(Enseignant.__table__, _v.enseignant_id == _e.id)
+    ))
+    stmt = _filtrer_voeux(stmt, enseignant_id, semestre_code_libelle, session_libelle)
     
     # Si limit est -1, retourner tous les résultats
     if limit == -1:
-        voeux = query.offset(skip).all()
-    else:
-        voeux = query.offset(skip).limit(limit).all()
+        stmt += lambda s: s.offset(skip)
+        
+        # Lecture par lots de 1000 lignes, envoyés au fil de l'eau : la table entière
+        # n'est jamais chargée en mémoire. Session dédiée, car celle de la requête
+        # est fermée avant l'envoi du corps de la réponse.
+        session_flux = SessionLocal()
+        try:
+            lots = session_flux.execute(stmt, execution_options={"yield_per": 1000}).partitions()
+            premier_lot = next(lots, [])
+            total = _total_voeux(db, premier_lot, skip, enseignant_id, semestre_code_libelle, session_libelle)
+        except Exception:
+            session_flux.close()
+            raise
+        
+        def generer_voeux():
+            try:
+                separateur = b"["
+                for lot in chain((premier_lot,), lots):
+                    if lot:
+                        yield separateur + b",".join(orjson.dumps(_voeu_en_dict(r)) for r in lot)
+                        separateur = b","
+                yield b"[]" if separateur == b"[" else b"]"
+            finally:
+                session_flux.close()
+        
+        return StreamingResponse(
+            generer_voeux(),
+            media_type="application/json",
+            headers={"X-Total-Count": str(total)}
+        )
+    
+    stmt += lambda s: s.offset(skip).limit(limit)
+    rows = db.execute(stmt).all()
+    total = _total_voeux(db, rows, skip, enseignant_id, semestre_code_libelle, session_libelle)
     
     # Ajouter les informations de l'enseignant dans la réponse
-    result = []
-    for voeu in voeux:
-        voeu_dict = {
-            "id": voeu.id,
-            "enseignant_id": voeu.enseignant_id,
-            "code_smartex_ens": voeu.code_smartex_ens,
-            "enseignant_nom": voeu.enseignant.nom if voeu.enseignant else None,
-            "enseignant_prenom": voeu.enseignant.prenom if voeu.enseignant else None,
-            "jour": voeu.jour,
-            "seance": voeu.seance,
-            "semestre_code_libelle": voeu.semestre_code_libelle,
-            "session_libelle": voeu.session_libelle,
-            "date_voeu": voeu.date_voeu if hasattr(voeu, 'date_voeu') else None,
-            "created_at": voeu.created_at
-        }
-        result.append(voeu_dict)
+    # Les lignes viennent de notre propre base : sérialisation directe par orjson,
+    # sans revalidation Pydantic de chaque vœu (response_model reste pour la documentation)
+    return ORJSONResponse(
+        [_voeu_en_dict(r) for r in rows],
+        headers={"X-Total-Count": str(total)}
+    )
+
+
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+def creer_voeux_en_lot(voeux: List[VoeuCreate], db: Session = Depends(get_db)):
+    """
+    Crée plusieurs vœux en une seule requête.
+    Les codes smartex manquants sont résolus en une requête IN, puis tous les vœux
+    sont insérés par un seul INSERT multi-lignes et un seul commit.
+    """
+    if not voeux:
+        return {"success": True, "message": "0 vœux créés", "nb_crees": 0}
+    
+    # Résoudre les enseignants référencés (existence + code smartex) en une requête
+    enseignant_ids = {voeu.enseignant_id for voeu in voeux}
+    codes = dict(
+        db.execute(
+            select(Enseignant.id, Enseignant.code_smartex).where(Enseignant.id.in_(enseignant_ids))
+        ).all()
+    )
+    
+    introuvables = sorted(enseignant_ids - codes.keys())
+    if introuvables:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Enseignant(s) introuvable(s) : {', '.join(map(str, introuvables))}"
+        )
+    
+    lignes = [
+        {**voeu.model_dump(), "code_smartex_ens": voeu.code_smartex_ens or codes[voeu.enseignant_id]}
+        for voeu in voeux
+    ]
+    db.execute(insert(Voeu), lignes)
+    db.commit()
     
-    return result
+    return {
+        "success": True,
+        "message": f"{len(lignes)} vœux créés",
+        "nb_crees": len(lignes)
+    }
 
 
 @router.delete("/vider", status_code=status.HTTP_200_OK)
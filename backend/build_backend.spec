@@ -54,6 +54,8 @@ a = Analysis(
         'uvicorn.protocols',
         'uvicorn.protocols.http',
         'uvicorn.protocols.http.auto',
+        'uvicorn.protocols.http.httptools_impl',
+        'httptools',
         'uvicorn.protocols.websockets',
         'uvicorn.protocols.websockets.auto',
         'uvicorn.protocols.websockets.wsproto_impl',
@@ -77,7 +79,6 @@ a = Analysis(
         'pydantic.types',
         'pydantic_core',
         'pydantic_settings',
-        'email_validator',
         # OR-Tools
         'ortools',
         'ortools.linear_solver',
@@ -114,6 +115,7 @@ a = Analysis(
         'dateutil.parser',
         'multipart',
         'aiofiles',
+        'orjson',
         'httpx',
         'dotenv',
         # Crypto
@@ -0,0 +1,74 @@
+"""
+Cache mémoire des réponses de lecture (statistiques, etc.)
+
+Les résultats sont invalidés automatiquement à chaque COMMIT sur la base :
+toute écriture (import, affectation, vœu, génération...) incrémente un
+compteur de version, et une entrée dont la version ne correspond plus est recalculée.
+Un TTL borne en plus la durée de vie de chaque entrée.
+"""
+import time
+from functools import wraps
+from threading import Lock
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event
+
+from config import CACHE_TTL_SECONDS
+from database import engine
+
+_version = 0
+# Identifiant du processus : le compteur repart de 0 à chaque démarrage
+_instance = format(time.time_ns(), "x")
+_entrees = {}
+_verrou = Lock()
+
+
+@event.listens_for(engine, "commit")
+def _invalider_sur_commit(conn):
+    """Toute transaction validée rend les réponses en cache obsolètes"""
+    global _version
+    with _verrou:
+        _version += 1
+
+
+def version_donnees() -> int:
+    """Version courante des données (incrémentée à chaque commit)"""
+    return _version
+
+
+def verifier_etag(request: Request, response: Response):
+    """
+    Dépendance de route : ETag faible dérivé de la version des données.
+    Répond 304 Not Modified (sans corps) si le client possède déjà cette version.
+    """
+    etag = f'W/"{_instance}-{_version}"'
+    if request.headers.get("if-none-match") == etag:
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+
+def en_cache(ttl: int = CACHE_TTL_SECONDS):
+    """
+    Décorateur de route : met en cache la réponse selon les paramètres de la requête.
+    La session `db` est exclue de la clé.
+    """
+    def decorateur(fonction):
+        @wraps(fonction)
+        def wrapper(*args, **kwargs):
+            cle = (fonction.__name__, tuple(sorted((k, v) for k, v in kwargs.items() if k != "db")))
+            version = _version
+            maintenant = time.monotonic()
+
+            entree = _entrees.get(cle)
+            if entree is not None and entree[0] == version and entree[1] > maintenant:
+                return entree[2]
+
+            resultat = fonction(*args, **kwargs)
+            # Lecture par un seul dict.get (atomique) ; écriture sous le même verrou que la version
+            with _verrou:
+                _entrees[cle] = (version, maintenant + ttl, resultat)
+            return resultat
+
+        return wrapper
+
+    return decorateur
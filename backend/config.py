@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from types import MappingProxyType
 
 # Application Settings
 APP_NAME = "Gestion Surveillances"
@@ -21,10 +22,20 @@ DATABASE_URL = f"sqlite:///{DATABASE_DIR}/surveillance.db"
 UPLOAD_DIR = BASE_DIR / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10 MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB par bloc lors de la copie des fichiers uploadés
+
+# Cache des réponses de lecture (invalidé à chaque écriture en base)
+CACHE_TTL_SECONDS = 60
+
+# Taille du cache SQLAlchemy des requêtes compilées (500 par défaut)
+QUERY_CACHE_SIZE = 1200
 
 # Export Settings
 EXPORT_DIR = BASE_DIR / "exports"
 EXPORT_DIR.mkdir(exist_ok=True)
+# Nombre minimal de convocations pour répartir leur génération sur plusieurs processus
+# (en dessous, le démarrage des processus coûte plus qu'il ne rapporte)
+EXPORT_PARALLELE_MIN = 16
 
 # Surveillance Configuration
 MIN_SURVEILLANTS_PAR_SALLE = 2
@@ -50,6 +61,12 @@ GRADES = {
 
 }
 
+# Vue en lecture seule et dérivés précalculés une fois au chargement
+GRADES = MappingProxyType(GRADES)
+GRADES_CODES = frozenset(GRADES)
+GRADES_NOMS = {code: info["nom"] for code, info in GRADES.items()}
+GRADES_NB_SURVEILLANCES = {code: info["nb_surveillances"] for code, info in GRADES.items()}
+
 # CORS Settings
 CORS_ORIGINS = [
     "http://localhost:3000",
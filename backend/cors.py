@@ -0,0 +1,102 @@
+"""
+Middleware CORS en ASGI pur
+
+Même comportement que le CORSMiddleware de Starlette pour la configuration de
+l'application (origines explicites, cookies autorisés, toutes méthodes et en-têtes),
+mais les en-têtes sont lus directement dans le scope (octets, sans objet Headers)
+et les en-têtes de réponse sont pré-encodés une fois pour toutes à l'initialisation.
+"""
+
+METHODES = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+
+
+class FastCORSMiddleware:
+    def __init__(self, app, allow_origins=(), expose_headers=(), max_age: int = 600):
+        self.app = app
+        self._origines = frozenset(origine.encode("latin-1") for origine in allow_origins)
+        self._methodes = frozenset(methode.encode("latin-1") for methode in METHODES)
+
+        # En-têtes ajoutés à toute réponse d'une requête portant un en-tête Origin
+        self._entetes_simples = [(b"access-control-allow-credentials", b"true")]
+        if expose_headers:
+            self._entetes_simples.append(
+                (b"access-control-expose-headers", ", ".join(expose_headers).encode("latin-1"))
+            )
+
+        # En-têtes communs à toutes les réponses de pré-vérification (OPTIONS)
+        self._entetes_preflight = [
+            (b"vary", b"Origin"),
+            (b"access-control-allow-methods", ", ".join(METHODES).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"access-control-allow-credentials", b"true"),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Un seul parcours des en-têtes bruts (noms déjà en minuscules en ASGI)
+        origine = methode_demandee = entetes_demandes = None
+        for nom, valeur in scope["headers"]:
+            if nom == b"origin":
+                if origine is None:
+                    origine = valeur
+            elif nom == b"access-control-request-method":
+                if methode_demandee is None:
+                    methode_demandee = valeur
+            elif nom == b"access-control-request-headers":
+                if entetes_demandes is None:
+                    entetes_demandes = valeur
+
+        if origine is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and methode_demandee is not None:
+            await self._repondre_preflight(send, origine, methode_demandee, entetes_demandes)
+            return
+
+        origine_autorisee = origine in self._origines
+
+        async def envoyer(message):
+            if message["type"] == "http.response.start":
+                entetes = list(message.get("headers", ()))
+                entetes.extend(self._entetes_simples)
+                if origine_autorisee:
+                    # Renvoyer l'origine exacte et l'ajouter à Vary
+                    entetes.append((b"access-control-allow-origin", origine))
+                    for i, (nom, valeur) in enumerate(entetes):
+                        if nom.lower() == b"vary":
+                            entetes[i] = (nom, valeur + b", Origin")
+                            break
+                    else:
+                        entetes.append((b"vary", b"Origin"))
+                message["headers"] = entetes
+            await send(message)
+
+        await self.app(scope, receive, envoyer)
+
+    async def _repondre_preflight(self, send, origine, methode_demandee, entetes_demandes):
+        """Répond directement à la pré-vérification, sans traverser l'application"""
+        entetes = list(self._entetes_preflight)
+        echecs = []
+
+        if origine in self._origines:
+            entetes.append((b"access-control-allow-origin", origine))
+        else:
+            echecs.append("origin")
+
+        if methode_demandee not in self._methodes:
+            echecs.append("method")
+
+        # Tous les en-têtes sont autorisés : on renvoie ceux demandés
+        if entetes_demandes is not None:
+            entetes.append((b"access-control-allow-headers", entetes_demandes))
+
+        corps = ("Disallowed CORS " + ", ".join(echecs)).encode() if echecs else b"OK"
+        entetes.append((b"content-length", str(len(corps)).encode("latin-1")))
+        entetes.append((b"content-type", b"text/plain; charset=utf-8"))
+
+        await send({"type": "http.response.start", "status": 400 if echecs else 200, "headers": entetes})
+        await send({"type": "http.response.body", "body": corps})
@@ -1,13 +1,29 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
+from config import DATABASE_URL, QUERY_CACHE_SIZE
 
 # Create database engine
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}, echo=False
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    echo=False,
+    query_cache_size=QUERY_CACHE_SIZE,
 )
 
+
+# Réglages SQLite appliqués à chaque nouvelle connexion
+@event.listens_for(engine, "connect")
+def _configurer_sqlite(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")  # lectures concurrentes pendant une écriture
+    cursor.execute("PRAGMA synchronous=NORMAL")  # moins de fsync (sûr en mode WAL)
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB lus via mmap
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB de cache de pages
+    cursor.close()
+
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -28,6 +44,11 @@ def get_db():
 def init_db():
     """Create all tables in the database"""
     Base.metadata.create_all(bind=engine)
+    # create_all ne crée les index qu'avec les nouvelles tables :
+    # ajouter ceux qui manquent sur une base existante
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
     print("Database initialized successfully")
 
 
@@ -1,16 +1,38 @@
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 import logging
 
-from database import init_db
+from database import init_db, engine
+from cors import FastCORSMiddleware
 from config import HOST, PORT, RELOAD, CORS_ORIGINS, LOG_LEVEL, LOG_FORMAT
 
 # Configuration du logging
 logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Actions au démarrage et à l'arrêt de l'application"""
+    logger.info("Demarrage de l'application...")
+
+    # Initialiser la base de données (hors de la boucle d'événements)
+    await run_in_threadpool(init_db)
+    logger.info("Base de donnees initialisee")
+
+    logger.info("API disponible sur http://%s:%s", HOST, PORT)
+    logger.info("Documentation sur http://%s:%s/api/docs", HOST, PORT)
+
+    yield
+
+    logger.info("Arret de l'application...")
+    # Fermer les connexions SQLite du pool
+    engine.dispose()
+
+
 # Création de l'application FastAPI
 app = FastAPI(
     title="API Gestion Surveillances",
@@ -18,15 +40,16 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
+    # Sérialisation JSON par orjson pour toutes les routes
+    default_response_class=ORJSONResponse,
 )
 
-# Configuration CORS
+# Configuration CORS (toutes méthodes et en-têtes, cookies autorisés)
 app.add_middleware(
-    CORSMiddleware,
+    FastCORSMiddleware,
     allow_origins=CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    expose_headers=["X-Total-Count", "ETag"],
 )
 
 # Import des routers
@@ -43,20 +66,24 @@ from api import (
 )
 
 # Enregistrement des routers
-app.include_router(enseignants.router, prefix="/api")
-app.include_router(examens.router, prefix="/api")
-app.include_router(voeux.router, prefix="/api")
-app.include_router(imports.router, prefix="/api")
-app.include_router(generation.router, prefix="/api")
-app.include_router(export.router, prefix="/api")
-app.include_router(statistiques.router, prefix="/api")
-app.include_router(grades.router, prefix="/api")
-app.include_router(planning.router, prefix="/api")
+for module in (
+    enseignants,
+    examens,
+    voeux,
+    imports,
+    generation,
+    export,
+    statistiques,
+    grades,
+    planning,
+):
+    app.include_router(module.router, prefix="/api")
 
 
 # Routes de base
+# (réponses constantes : async def, exécutées directement sans passer par le pool de threads)
 @app.get("/")
-def root():
+async def root():
     """Route racine"""
     return {
         "application": "Gestion Surveillances",
@@ -67,47 +94,44 @@ def root():
 
 
 @app.get("/api/health")
-def health_check():
+async def health_check():
     """Vérification de l'état du service"""
     return {"status": "healthy", "service": "surveillance-api"}
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Actions au démarrage de l'application"""
-    logger.info("Demarrage de l'application...")
-
-    # Initialiser la base de données
-    init_db()
-    logger.info("Base de donnees initialisee")
-
-    logger.info(f"API disponible sur http://{HOST}:{PORT}")
-    logger.info(f"Documentation sur http://{HOST}:{PORT}/api/docs")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Actions à l'arrêt de l'application"""
-    logger.info("Arret de l'application...")
-
-
 if __name__ == "__main__":
     import sys
+    import multiprocessing
+
+    # Processus de travail (exports parallèles) dans l'exécutable PyInstaller
+    multiprocessing.freeze_support()
 
     # Detect if running as PyInstaller executable
     is_frozen = getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS")
 
+    # loop/http "auto" : uvloop et httptools s'ils sont installés, sinon asyncio et h11.
+    # Un seul worker : le cache des réponses et la version des données (cache.py)
+    # sont propres au processus.
     if is_frozen:
         # Running as executable - disable Uvicorn's logging to avoid isatty() error
         uvicorn.run(
             app,  # Pass app directly instead of string
             host=HOST,
             port=PORT,
+            loop="auto",
+            http="auto",
             log_config=None,  # Disable default logging config
             access_log=False,  # Disable access logs
         )
     else:
         # Running in development - use normal logging
         uvicorn.run(
-            "main:app", host=HOST, port=PORT, reload=RELOAD, log_level=LOG_LEVEL.lower()
+            "main:app",
+            host=HOST,
+            port=PORT,
+            reload=RELOAD,
+            loop="auto",
+            http="auto",
+            log_level=LOG_LEVEL.lower(),
+            access_log=False,  # Pas de ligne de log formatée à chaque requête
         )
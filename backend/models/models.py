@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Date, Time, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Date, Time, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -30,7 +30,7 @@ class Voeu(Base):
     __tablename__ = "voeux"
 
     id = Column(Integer, primary_key=True, index=True)
-    enseignant_id = Column(Integer, ForeignKey("enseignants.id"), nullable=False)
+    enseignant_id = Column(Integer, ForeignKey("enseignants.id"), nullable=False, index=True)  # filtre de /voeux et relation enseignant.voeux
     code_smartex_ens = Column(String(50), nullable=True, index=True)  # Code smartex de l'enseignant
     semestre_code_libelle = Column(String(50), nullable=True)  # "Semestre1", "Semestre2" - colonne "Semestre" dans Excel
     session_libelle = Column(String(50), nullable=True)  # "Partiel", "Examen", "Rattrapage" - colonne "Session" dans Excel
@@ -49,6 +49,10 @@ class Voeu(Base):
 
 class Examen(Base):
     __tablename__ = "examens"
+    __table_args__ = (
+        # Filtre/regroupement par séance (date + h_debut + h_fin + session + semestre)
+        Index("ix_examen_seance", "dateExam", "h_debut", "h_fin", "session", "semestre"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     dateExam = Column(Date, nullable=False, index=True)  # Correspond à colonne Excel
@@ -71,6 +75,12 @@ class Examen(Base):
 
 class Affectation(Base):
     __tablename__ = "affectations"
+    __table_args__ = (
+        # Affectations d'un enseignant restreintes aux examens d'une séance
+        Index("ix_aff_ens_exam", "enseignant_id", "examen_id"),
+        # Parcours des affectations par examen (jointure vers les séances dans les statistiques)
+        Index("ix_aff_exam_ens", "examen_id", "enseignant_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     examen_id = Column(Integer, ForeignKey("examens.id"), nullable=False)
@@ -1,42 +1,59 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, List, Literal
 from datetime import datetime, date, time
+import re
+
+# Format d'adresse e-mail (vérification syntaxique simple, compilée une seule fois)
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _valider_email(email: Optional[str]) -> Optional[str]:
+    if email is not None and not _EMAIL_RE.match(email):
+        raise ValueError("Adresse e-mail invalide")
+    return email
 
 # ============ Enseignant Schemas ============
 class EnseignantBase(BaseModel):
     nom: str = Field(..., min_length=1, max_length=100)
     prenom: str = Field(..., min_length=1, max_length=100)
-    email: EmailStr
+    email: str
     grade: str = Field(..., min_length=1, max_length=50)
     grade_code: str = Field(..., min_length=1, max_length=10)
     code_smartex: str = Field(..., min_length=1, max_length=50)
     abrv_ens: Optional[str] = Field(None, max_length=50)  # Abréviation de l'enseignant (ex: P.NOM)
     participe_surveillance: bool = True
 
+    verifier_email = field_validator("email")(_valider_email)
+
 class EnseignantCreate(EnseignantBase):
     pass
 
 class EnseignantUpdate(BaseModel):
     nom: Optional[str] = Field(None, min_length=1, max_length=100)
     prenom: Optional[str] = Field(None, min_length=1, max_length=100)
-    email: Optional[EmailStr] = None
+    email: Optional[str] = None
     grade: Optional[str] = Field(None, min_length=1, max_length=50)
     grade_code: Optional[str] = Field(None, min_length=1, max_length=10)
     abrv_ens: Optional[str] = Field(None, max_length=50)  # Abréviation de l'enseignant
     participe_surveillance: Optional[bool] = None
 
+    verifier_email = field_validator("email")(_valider_email)
+
 class EnseignantResponse(EnseignantBase):
     id: int
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ============ Voeu Schemas ============
+# Valeurs fixes : vérifiées par appartenance à un ensemble plutôt que par expression régulière
+Jour = Literal["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi"]
+Seance = Literal["S1", "S2", "S3", "S4"]
+
 class VoeuBase(BaseModel):
-    jour: str = Field(..., pattern="^(Lundi|Mardi|Mercredi|Jeudi|Vendredi|Samedi)$")  # Nom du jour
-    seance: str = Field(..., pattern="^(S1|S2|S3|S4)$")  # S1, S2, S3, S4
+    jour: Jour  # Nom du jour
+    seance: Seance  # S1, S2, S3, S4
     semestre_code_libelle: str = Field(..., max_length=50)  # Semestre1 ou Semestre2
     session_libelle: str = Field(..., max_length=50)  # Partiel, Examen ou Rattrapage
     date_voeu: Optional[date] = None  # Date du vœu (optionnel)
@@ -46,8 +63,8 @@ class VoeuCreate(VoeuBase):
     code_smartex_ens: Optional[str] = Field(None, max_length=50)  # Optionnel lors de la création
 
 class VoeuUpdate(BaseModel):
-    jour: Optional[str] = Field(None, pattern="^(Lundi|Mardi|Mercredi|Jeudi|Vendredi|Samedi)$")
-    seance: Optional[str] = Field(None, pattern="^(S1|S2|S3|S4)$")
+    jour: Optional[Jour] = None
+    seance: Optional[Seance] = None
     semestre_code_libelle: Optional[str] = Field(None, max_length=50)
     session_libelle: Optional[str] = Field(None, max_length=50)
     code_smartex_ens: Optional[str] = Field(None, max_length=50)
@@ -61,8 +78,7 @@ class VoeuResponse(VoeuBase):
     enseignant_prenom: Optional[str] = None  # Prénom de l'enseignant
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ============ Examen Schemas ============
 class ExamenBase(BaseModel):
@@ -95,8 +111,7 @@ class ExamenResponse(ExamenBase):
     responsable_nom: Optional[str] = None  # Nom du responsable d'examen
     responsable_prenom: Optional[str] = None  # Prénom du responsable d'examen
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============ Generation Schemas ============
@@ -146,8 +161,7 @@ class GradeConfigResponse(GradeConfigBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ============ Affectation Schemas ============
 class AjouterEnseignantSeanceRequest(BaseModel):
@@ -1,27 +1,119 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx2pdf import convert
-import pandas as pd
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, bindparam, func, case
+from sqlalchemy.orm import Session, joinedload, selectinload
 from models.models import Enseignant, Examen, Affectation
-from datetime import datetime, date
-from typing import List, Dict
+from datetime import datetime, date, time
+from typing import List, Dict, TYPE_CHECKING
+from functools import lru_cache
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
 import os
 import sys
-from config import EXPORT_DIR
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO
+from xml.sax.saxutils import escape
+from config import EXPORT_DIR, EXPORT_PARALLELE_MIN
 import logging
 
+# Bibliothèques de génération (reportlab, python-docx, docx2pdf, xlsxwriter) importées
+# dans les méthodes qui les utilisent : coût payé au premier export, pas au démarrage
+if TYPE_CHECKING:
+    from docx.document import Document
+    from reportlab.platypus import Table
+
 logger = logging.getLogger(__name__)
 
+# Code de session -> texte complet
+CONVERSIONS_SESSION = {
+    'P': 'Principale',
+    'R': 'Rattrapage',
+    'C': 'Contrôle'  # Au cas où
+}
+
+# Horaires (h_debut, h_fin) de chaque séance, au format string "HH:MM" pour l'affichage
+HORAIRES_SEANCES = {
+    'S1': ('08:30', '10:00'),
+    'S2': ('10:30', '12:00'),
+    'S3': ('12:30', '14:00'),
+    'S4': ('14:30', '16:00')
+}
+
+# Mêmes horaires en objets time pour les requêtes SQL, convertis une seule fois au chargement
+HEURES_SEANCES = {
+    seance: tuple(time(*map(int, horaire.split(':'))) for horaire in horaires)
+    for seance, horaires in HORAIRES_SEANCES.items()
+}
+
+# Affectations d'un enseignant triées par date et heure : requête construite une seule fois,
+# seul le paramètre lié "eid" change d'un appel à l'autre (forme compilée réutilisée)
+AFFECTATIONS_ENSEIGNANT = (
+    select(Affectation)
+    .options(joinedload(Affectation.examen))
+    .join(Examen)
+    .where(Affectation.enseignant_id == bindparam("eid"))
+    .order_by(Examen.dateExam, Examen.h_debut)
+)
+
+# Repère laissé dans le XML d'un tableau Word à la place des lignes écrites directement en texte
+REPERE_LIGNES = "lignes-differees:"
+
+# Tableau des surveillants d'une séance (Enseignant | Salle | Signature) : propriétés, grille
+# et ligne d'en-tête (texte blanc en gras sur fond bleu) en XML prêt à l'emploi
+TABLEAU_SEANCE_XML = (
+    '<w:tbl xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:type="auto" w:w="0"/><w:tblLayout w:type="fixed"/>'
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" '
+    'w:noVBand="1" w:val="04A0"/>'
+    # Largeur du tableau : 100% de la largeur disponible
+    '<w:tblW w:w="5000" w:type="pct"/></w:tblPr>'
+    '<w:tblGrid><w:gridCol w:w="3600"/><w:gridCol w:w="3600"/><w:gridCol w:w="3600"/></w:tblGrid>'
+    '<w:tr>'
+    + ''.join(
+        f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{largeur}"/><w:vAlign w:val="center"/>'
+        '<w:shd w:fill="003399"/></w:tcPr><w:p><w:pPr><w:jc w:val="center"/></w:pPr>'
+        '<w:r><w:rPr><w:b/><w:color w:val="FFFFFF"/><w:sz w:val="22"/></w:rPr>'
+        f'<w:t>{texte}</w:t></w:r></w:p></w:tc>'
+        # Enseignant (3.5"), Salle et Signature (1.75")
+        for texte, largeur in (('Enseignant', 5040), ('Salle', 2520), ('Signature', 2520))
+    )
+    + '</w:tr></w:tbl>'
+)
+
+# Ligne d'un surveillant : hauteur fixe de 300 twips (environ 0.53 cm), nom en 8 pt aligné
+# à gauche, cellules Salle et Signature vides (paragraphe seul, sans run) ;
+# {texte} reçoit l'élément <w:t> du nom
+LIGNE_SEANCE_XML = (
+    '<w:tr><w:trPr><w:trHeight w:val="300" w:hRule="exact"/></w:trPr>'
+    '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="3600"/><w:vAlign w:val="center"/></w:tcPr>'
+    '<w:p><w:pPr><w:jc w:val="left"/></w:pPr><w:r><w:rPr><w:sz w:val="16"/></w:rPr>{texte}</w:r></w:p></w:tc>'
+    + '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="3600"/><w:vAlign w:val="center"/></w:tcPr><w:p/></w:tc>' * 2
+    + '</w:tr>'
+)
+
+# Surveillants d'un examen pour le planning global : noms distincts (« (R) » pour le responsable,
+# car plusieurs enseignants peuvent être dans la même salle) dans l'ordre des affectations,
+# séparés par des retours à la ligne. Sous-requête scalaire corrélée à la ligne de l'examen :
+# l'agrégat lit la sous-requête triée dans l'ordre, sans regroupement qui le réordonnerait.
+_nom_surveillant = (
+    Enseignant.nom + ' ' + Enseignant.prenom
+    + case((Affectation.est_responsable == True, ' (R)'), else_='')
+).label('nom_complet')
+_noms_surveillants = (
+    select(_nom_surveillant)
+    .select_from(Affectation)
+    .join(Enseignant, Affectation.enseignant_id == Enseignant.id)
+    .where(Affectation.examen_id == Examen.id)
+    .group_by(_nom_surveillant)
+    .order_by(func.min(Affectation.id))
+    .correlate(Examen)
+    .subquery()
+)
+SURVEILLANTS_EXAMEN = select(func.group_concat(_noms_surveillants.c.nom_complet, '\n')).scalar_subquery()
+
+# Hauteur de la ligne d'en-tête du planning PDF : interligne + marges haute (3) et basse (12)
+HAUTEUR_EN_TETE_PDF = 12 + 3 + 12
+
 
 def get_resource_path(relative_path):
     """
@@ -43,6 +135,119 @@ def get_resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+@lru_cache(maxsize=64)
+def _formater_duree(debut_heure: int, debut_minute: int, fin_heure: int, fin_minute: int) -> str:
+    """Durée d'un créneau au format "2h00" ou "1h30" (peu de créneaux distincts : mise en cache)"""
+    # Convertir en minutes pour calculer la durée
+    heures, minutes = divmod((fin_heure * 60 + fin_minute) - (debut_heure * 60 + debut_minute), 60)
+    return f"{heures}h{minutes:02d}"
+
+
+@lru_cache(maxsize=None)
+def _styles_pdf() -> Dict[str, object]:
+    """Styles reportlab des documents PDF (paragraphes et tableaux)
+    
+    Construits au premier export puis réutilisés tels quels : reportlab n'est pas importé
+    au chargement du module.
+    """
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.platypus import TableStyle
+    from reportlab.lib import colors
+    bleu = colors.HexColor('#003399')
+    
+    texte = ParagraphStyle('ConvocationTexte', fontName='Helvetica', fontSize=11, leading=14)
+    entete_titre = ParagraphStyle(
+        'EnteteTitre', fontName='Helvetica-Bold', fontSize=13, leading=16, textColor=bleu, alignment=TA_CENTER
+    )
+    return {
+        'texte': texte,
+        'note': ParagraphStyle(
+            'ConvocationNote', parent=texte, fontName='Helvetica-Bold', fontSize=14,
+            leading=18, textColor=bleu, alignment=TA_CENTER
+        ),
+        'nom': ParagraphStyle(
+            'ConvocationNom', parent=texte, fontSize=12, leading=15, textColor=bleu, alignment=TA_CENTER
+        ),
+        'entete_titre': entete_titre,
+        'entete_ref': ParagraphStyle('EnteteReference', parent=entete_titre, fontSize=10, leading=12),
+        'entete_liste': ParagraphStyle('EnteteListe', parent=entete_titre, fontSize=12, leading=15),
+        # Tableau Date | Heure | Durée des convocations
+        'tableau': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), bleu),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ]),
+        # Tableau d'en-tête ISI (logo fusionné sur les trois lignes)
+        'entete': TableStyle([
+            ('SPAN', (0, 0), (0, 2)),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('GRID', (0, 0), (-1, -1), 1.5, colors.black),
+        ]),
+    }
+
+
+@lru_cache(maxsize=None)
+def _document_modele():
+    """Document Word avec l'en-tête (tableau, logo) et le pied de page ISI, construit une seule fois
+    par processus
+    
+    Ne jamais le modifier : chaque export travaille sur une copie (_nouveau_document).
+    """
+    from docx import Document
+    doc = Document()
+    service = ExportService(None)
+    service._ajouter_entete(doc)
+    service._ajouter_pied_de_page(doc)
+    return doc
+
+
+def _nouveau_document():
+    """Nouveau document Word avec en-tête et pied de page ISI : copie du modèle déjà construit
+    (parties d'en-tête, de pied de page et image du logo comprises)"""
+    return deepcopy(_document_modele())
+
+
+def _texte_xml(texte: str) -> str:
+    """Élément <w:t> tel que python-docx l'écrit (espaces de début/fin préservés)"""
+    if len(texte.strip()) < len(texte):
+        return f'<w:t xml:space="preserve">{escape(texte)}</w:t>'
+    return f'<w:t>{escape(texte)}</w:t>'
+
+
+def _developper_lignes(document_xml: str, lignes_differees: List[List[str]]) -> str:
+    """Remplace chaque repère de lignes différées par une ligne LIGNE_SEANCE_XML par nom"""
+    morceaux = []
+    position = 0
+    for indice, noms in enumerate(lignes_differees):
+        repere = f"<!--{REPERE_LIGNES}{indice}-->"
+        fin = document_xml.index(repere, position)
+        morceaux.append(document_xml[position:fin])
+        morceaux.extend(LIGNE_SEANCE_XML.format(texte=_texte_xml(nom)) for nom in noms)
+        position = fin + len(repere)
+    
+    morceaux.append(document_xml[position:])
+    return "".join(morceaux)
+
+
+def _generer_convocation_processus(nom: str, prenom: str, seances_list: List[dict], filepath: str) -> str:
+    """Génère une convocation Word dans un processus de travail (données simples, sans session)"""
+    ExportService(None)._ecrire_convocation_word(nom, prenom, seances_list, filepath)
+    return filepath
+
+
+def _generer_convocation_pdf_processus(nom: str, prenom: str, seances_list: List[dict], filepath: str) -> str:
+    """Génère une convocation PDF dans un processus de travail (données simples, sans session)"""
+    ExportService(None)._ecrire_convocation_pdf(nom, prenom, seances_list, filepath)
+    return filepath
+
+
 class ExportService:
     """Service pour l'export de documents (PDF, Word, Excel)"""
     
@@ -60,14 +265,10 @@ class ExportService:
         Returns:
             Texte complet de la session (Principale, Rattrapage, etc.)
         """
-        conversions = {
-            'P': 'Principale',
-            'R': 'Rattrapage',
-            'C': 'Contrôle'  # Au cas où
-        }
-        return conversions.get(code_session, code_session)
+        return CONVERSIONS_SESSION.get(code_session, code_session)
     
     @staticmethod
+    @lru_cache(maxsize=64)
     def _determiner_numero_seance(h_debut) -> str:
         """Détermine le numéro de séance en fonction de l'heure de début
         
@@ -76,9 +277,9 @@ class ExportService:
             
         Returns:
             Numéro de séance (S1, S2, S3, S4)
-        """
-        from datetime import time
         
+        Résultat mis en cache : peu d'horaires distincts, appelée pour chaque groupe d'examens
+        """
         # Si c'est un string, le convertir en time object
         if isinstance(h_debut, str):
             heures, minutes = map(int, h_debut.split(':'))
@@ -122,48 +323,54 @@ class ExportService:
         Returns:
             Tuple (h_debut, h_fin) au format string "HH:MM"
         """
-        horaires = {
-            'S1': ('08:30', '10:00'),
-            'S2': ('10:30', '12:00'),
-            'S3': ('12:30', '14:00'),
-            'S4': ('14:30', '16:00')
-        }
-        
         seance_upper = seance.upper()
-        if seance_upper not in horaires:
+        if seance_upper not in HORAIRES_SEANCES:
             raise ValueError(f"Séance invalide '{seance}'. Doit être S1, S2, S3 ou S4")
         
-        return horaires[seance_upper]
+        return HORAIRES_SEANCES[seance_upper]
     
     def generer_planning_global_pdf(self, date_debut: date = None, date_fin: date = None) -> str:
-        """Génère le planning global en PDF"""
+        """Génère le planning global en PDF
+        
+        Dessin direct sur le canevas reportlab, ligne par ligne, avec saut de page manuel :
+        pas de moteur de mise en page Platypus ni de liste complète d'éléments en mémoire.
+        """
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import cm
+        from reportlab.pdfgen import canvas
+        from reportlab.lib import colors
         filename = f"planning_global_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         filepath = os.path.join(self.export_dir, filename)
         
-        doc = SimpleDocTemplate(filepath, pagesize=A4)
-        elements = []
-        styles = getSampleStyleSheet()
+        largeur_page, hauteur_page = A4
+        marge = 2.54*cm
+        largeurs = [3*cm, 2.5*cm, 2*cm, 3*cm, 7*cm]
+        # Tableau centré sur la page (plus large que la zone de texte)
+        x_tableau = (largeur_page - sum(largeurs)) / 2
+        en_tetes = ['Horaire', 'Salle', 'Session', 'Semestre', 'Surveillants']
+        
+        c = canvas.Canvas(filepath, pagesize=A4)
+        y = hauteur_page - marge
         
         # Titre
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#1a237e'),
-            spaceAfter=30,
-            alignment=TA_CENTER
+        c.setFont('Helvetica-Bold', 16)
+        c.setFillColor(colors.HexColor('#1a237e'))
+        c.drawCentredString(largeur_page / 2, y - 16, "PLANNING GLOBAL DES SURVEILLANCES")
+        y -= 22 + 30 + 0.5*cm
+        
+        # Requête des examens avec filtres de date ; la liste des surveillants de chaque examen
+        # est construite par la base (GROUP_CONCAT), sans charger affectations ni enseignants
+        exa = Examen.__table__.c
+        query = select(
+            exa.dateExam, exa.h_debut, exa.h_fin, exa.cod_salle, exa.session, exa.semestre,
+            SURVEILLANTS_EXAMEN.label('surveillants')
         )
-        elements.append(Paragraph("PLANNING GLOBAL DES SURVEILLANCES", title_style))
-        elements.append(Spacer(1, 0.5*cm))
-        
-        # Requête des examens avec filtres de date
-        query = self.db.query(Examen)
         if date_debut:
-            query = query.filter(Examen.dateExam >= date_debut)
+            query = query.where(exa.dateExam >= date_debut)
         if date_fin:
-            query = query.filter(Examen.dateExam <= date_fin)
+            query = query.where(exa.dateExam <= date_fin)
         
-        examens = query.order_by(Examen.dateExam, Examen.h_debut).all()
+        examens = self.db.execute(query.order_by(exa.dateExam, exa.h_debut)).all()
         
         # Grouper par date
         examens_par_date = {}
@@ -175,36 +382,11 @@ class ExportService:
         
         # Générer le contenu pour chaque date
         for date_exam, liste_examens in sorted(examens_par_date.items()):
-            # Titre de la date
-            date_style = ParagraphStyle(
-                'DateStyle',
-                parent=styles['Heading2'],
-                fontSize=12,
-                textColor=colors.HexColor('#0d47a1'),
-                spaceAfter=10
-            )
-            elements.append(Paragraph(f"Date: {date_exam.strftime('%d/%m/%Y')}", date_style))
-            
-            # Tableau des examens
-            data = [['Horaire', 'Salle', 'Session', 'Semestre', 'Surveillants']]
-            
+            # Lignes du tableau des examens
+            lignes = []
             for examen in liste_examens:
-                affectations = self.db.query(Affectation).options(
-                    joinedload(Affectation.enseignant)
-                ).filter(
-                    Affectation.examen_id == examen.id
-                ).all()
-                
-                surveillants = []
-                for aff in affectations:
-                    ens = aff.enseignant
-                    nom_complet = f"{ens.nom} {ens.prenom}"
-                    if aff.est_responsable:
-                        nom_complet += " (R)"
-                    surveillants.append(nom_complet)
-                
-                # Enlever les doublons (car plusieurs enseignants peuvent être dans la même salle)
-                surveillants = list(dict.fromkeys(surveillants))
+                # Noms distincts, déjà concaténés par la base dans l'ordre des affectations
+                surveillants = examen.surveillants.split("\n") if examen.surveillants else []
                 
                 horaire = f"{examen.h_debut.strftime('%H:%M')} - {examen.h_fin.strftime('%H:%M')}"
                 salle = examen.cod_salle
@@ -215,65 +397,161 @@ class ExportService:
                 if len(surveillants) > 3:
                     surveillants_str += f"\n+ {len(surveillants) - 3} autres"
                 
-                data.append([horaire, salle, session, semestre, surveillants_str])
+                lignes.append([horaire, salle, session, semestre, surveillants_str])
+            
+            # Titre de la date (gardé avec l'en-tête et la première ligne du tableau)
+            hauteur_debut = 12 + 18 + 10 + HAUTEUR_EN_TETE_PDF + self._hauteur_ligne_pdf(lignes[0])
+            if y - hauteur_debut < marge:
+                c.showPage()
+                y = hauteur_page - marge
+            else:
+                y -= 12
+            c.setFont('Helvetica-Bold', 12)
+            c.setFillColor(colors.HexColor('#0d47a1'))
+            c.drawString(marge, y - 12, f"Date: {date_exam.strftime('%d/%m/%Y')}")
+            y -= 18 + 10
             
-            table = Table(data, colWidths=[3*cm, 2.5*cm, 2*cm, 3*cm, 7*cm])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976d2')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ]))
+            # Tableau des examens (en-tête répété en haut de chaque nouvelle page)
+            y = self._dessiner_ligne_pdf(c, x_tableau, y, largeurs, en_tetes, en_tete=True)
+            for ligne in lignes:
+                if y - self._hauteur_ligne_pdf(ligne) < marge:
+                    c.showPage()
+                    y = self._dessiner_ligne_pdf(c, x_tableau, hauteur_page - marge, largeurs, en_tetes, en_tete=True)
+                y = self._dessiner_ligne_pdf(c, x_tableau, y, largeurs, ligne)
             
-            elements.append(table)
-            elements.append(Spacer(1, 0.5*cm))
+            y -= 0.5*cm
         
         # Générer le PDF
-        doc.build(elements)
+        c.save()
         logger.info(f"✅ Planning global PDF généré: {filepath}")
         return filepath
     
+    @staticmethod
+    def _hauteur_ligne_pdf(cellules: List[str]) -> float:
+        """Hauteur d'une ligne du planning PDF : 12 pt par ligne de texte + marges de 3 pt"""
+        return 12 * max(cellule.count("\n") + 1 for cellule in cellules) + 6
+    
+    def _dessiner_ligne_pdf(self, c, x: float, y: float, largeurs: List[float], cellules: List[str], en_tete: bool = False) -> float:
+        """Dessine une ligne du planning PDF sous l'ordonnée y et retourne l'ordonnée de son bas
+        
+        Args:
+            c: Canevas reportlab
+            x, y: Coin haut gauche de la ligne
+            largeurs: Largeur de chaque colonne
+            cellules: Texte de chaque cellule (lignes séparées par des retours à la ligne)
+            en_tete: Ligne d'en-tête (fond bleu, texte blanc en gras)
+        """
+        from reportlab.lib import colors
+        hauteur = HAUTEUR_EN_TETE_PDF if en_tete else self._hauteur_ligne_pdf(cellules)
+        fond = colors.HexColor('#1976d2') if en_tete else colors.beige
+        
+        # Fond de toute la ligne, puis bordure et texte de chaque cellule
+        c.setFillColor(fond)
+        c.rect(x, y - hauteur, sum(largeurs), hauteur, stroke=0, fill=1)
+        c.setLineWidth(1)
+        c.setStrokeColor(colors.black)
+        
+        if en_tete:
+            c.setFillColor(colors.whitesmoke)
+            c.setFont('Helvetica-Bold', 9)
+            taille = 9
+        else:
+            c.setFillColor(colors.black)
+            c.setFont('Helvetica', 8)
+            taille = 8
+        
+        for largeur, cellule in zip(largeurs, cellules):
+            c.rect(x, y - hauteur, largeur, hauteur, stroke=1, fill=0)
+            # Texte aligné en haut à gauche, marges de 6 pt (gauche) et 3 pt (haut)
+            for i, texte in enumerate(cellule.split("\n")):
+                c.drawString(x + 6, y - 3 - taille - 12 * i, texte)
+            x += largeur
+        
+        return y - hauteur
+    
     def generer_convocations_individuelles(self) -> List[str]:
         """Génère les convocations individuelles pour chaque enseignant (Word + PDF)"""
-        filepaths = []
+        filepaths = self._ecrire_convocations(self._taches_convocations('docx'), _generer_convocation_processus)
         
-        enseignants = self.db.query(Enseignant).all()
+        logger.info(f"✅ {len(filepaths)} convocations générées")
+        return filepaths
+    
+    def _taches_convocations(self, extension: str) -> List[tuple]:
+        """Données simples (picklables) de chaque convocation à produire : (nom, prénom, séances, chemin)"""
+        # Enseignants, affectations et examens chargés en une fois (au lieu d'une requête par enseignant)
+        enseignants = self.db.query(Enseignant).options(
+            selectinload(Enseignant.affectations).joinedload(Affectation.examen)
+        ).all()
         
+        taches = []
         for enseignant in enseignants:
-            # Récupérer les affectations
-            affectations = self.db.query(Affectation).options(
-                joinedload(Affectation.examen)
-            ).filter(
-                Affectation.enseignant_id == enseignant.id
-            ).join(Examen).order_by(Examen.dateExam, Examen.h_debut).all()
-            
+            # Ignorer les affectations dont l'examen n'existe plus (comme la jointure sur Examen)
+            affectations = [aff for aff in enseignant.affectations if aff.examen is not None]
             if not affectations:
                 continue
             
-            # Générer Word
-            filename_word = f"convocation_{enseignant.nom}_{enseignant.prenom}_{datetime.now().strftime('%Y%m%d')}.docx"
-            filepath_word = os.path.join(self.export_dir, filename_word)
-            self._generer_convocation_word(enseignant, affectations, filepath_word)
-            filepaths.append(filepath_word)
+            filename = f"convocation_{enseignant.nom}_{enseignant.prenom}_{datetime.now().strftime('%Y%m%d')}.{extension}"
+            filepath = os.path.join(self.export_dir, filename)
+            taches.append((enseignant.nom, enseignant.prenom, self._seances_convocation(affectations), filepath))
         
-        logger.info(f"✅ {len(filepaths)} convocations générées")
-        return filepaths
+        return taches
+    
+    @staticmethod
+    def _ecrire_convocations(taches: List[tuple], ecrire) -> List[str]:
+        """Écrit chaque convocation avec `ecrire` (fonction de module) et retourne les chemins produits"""
+        if len(taches) >= EXPORT_PARALLELE_MIN:
+            # Documents indépendants : construction répartie sur plusieurs processus
+            # (la session n'est pas partagée, seules les données simples sont transmises)
+            with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(taches))) as executor:
+                return list(executor.map(ecrire, *zip(*taches)))
+        
+        return [ecrire(*tache) for tache in taches]
+    
+    @staticmethod
+    def _seances_convocation(affectations: List[Affectation]) -> List[dict]:
+        """Séances distinctes (date + horaires) des affectations, triées par date puis heure de début"""
+        # Regrouper les affectations par séance (date + horaires) pour éviter les doublons
+        seances = {}
+        for aff in affectations:
+            examen = aff.examen
+            key = (examen.dateExam, examen.h_debut, examen.h_fin)
+            if key not in seances:
+                seances[key] = {
+                    'date': examen.dateExam,
+                    'h_debut': examen.h_debut,
+                    'h_fin': examen.h_fin
+                }
+        
+        # Trier par date puis heure de début
+        return sorted(seances.values(), key=lambda x: (x['date'], x['h_debut']))
     
     def _generer_convocation_word(self, enseignant: Enseignant, affectations: List[Affectation], filepath: str):
         """Génère une convocation Word pour un enseignant"""
-        doc = Document()
-        
-        # Ajouter l'en-tête ISI
-        self._ajouter_entete(doc)
-        
-        # Ajouter le pied de page ISI
-        self._ajouter_pied_de_page(doc)
+        self._ecrire_convocation_word(
+            enseignant.nom, enseignant.prenom, self._seances_convocation(affectations), filepath
+        )
+    
+    @staticmethod
+    def _lignes_convocation(seances_list: List[dict]) -> List[tuple]:
+        """Textes (date, heure, durée) des lignes du tableau de convocation"""
+        return [
+            (
+                seance['date'].strftime('%d/%m/%Y'),
+                seance['h_debut'].strftime('%H:%M'),
+                _formater_duree(
+                    seance['h_debut'].hour, seance['h_debut'].minute,
+                    seance['h_fin'].hour, seance['h_fin'].minute
+                )
+            )
+            for seance in seances_list
+        ]
+    
+    def _ecrire_convocation_word(self, nom: str, prenom: str, seances_list: List[dict], filepath: str):
+        """Construit et enregistre la convocation Word à partir des séances déjà regroupées"""
+        from docx.shared import Inches, Pt, RGBColor
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        # Document avec l'en-tête et le pied de page ISI
+        doc = _nouveau_document()
         
         # Ajouter un retour à la ligne après l'entête
         doc.add_paragraph()
@@ -286,7 +564,7 @@ class ExportService:
         run_note.font.size = Pt(14)
         run_note.font.color.rgb = RGBColor(0, 51, 153)
         
-        run_nom = note_para.add_run(f'M./Mme {enseignant.nom} {enseignant.prenom}')
+        run_nom = note_para.add_run(f'M./Mme {nom} {prenom}')
         run_nom.font.size = Pt(12)
         run_nom.font.color.rgb = RGBColor(0, 51, 153)
         
@@ -305,21 +583,6 @@ class ExportService:
         
         doc.add_paragraph()
         
-        # Regrouper les affectations par séance (date + horaires) pour éviter les doublons
-        seances = {}
-        for aff in affectations:
-            examen = aff.examen
-            key = (examen.dateExam, examen.h_debut, examen.h_fin)
-            if key not in seances:
-                seances[key] = {
-                    'date': examen.dateExam,
-                    'h_debut': examen.h_debut,
-                    'h_fin': examen.h_fin
-                }
-        
-        # Trier par date puis heure de début
-        seances_list = sorted(seances.values(), key=lambda x: (x['date'], x['h_debut']))
-        
         # Tableau des surveillances simplifié : Date | Heure | Durée
         table = doc.add_table(rows=1, cols=3)
         table.style = 'Table Grid'
@@ -349,39 +612,31 @@ class ExportService:
             # Fond bleu vif pour l'en-tête
             self._set_cell_background(cell, "003399")
         
-        for seance in seances_list:
+        ligne_modele = None
+        for date_str, heure_str, duree_str in self._lignes_convocation(seances_list):
+            if ligne_modele is not None:
+                # Lignes suivantes : copie de la première ligne déjà mise en forme
+                self._ajouter_ligne_copiee(table, ligne_modele, (date_str, heure_str, duree_str))
+                continue
+            
             row_cells = table.add_row().cells
             
             # Date
             self._set_cell_vertical_alignment(row_cells[0], 'center')
-            row_cells[0].text = seance['date'].strftime('%d/%m/%Y')
+            row_cells[0].text = date_str
             row_cells[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
             
             # Heure
             self._set_cell_vertical_alignment(row_cells[1], 'center')
-            row_cells[1].text = seance['h_debut'].strftime('%H:%M')
+            row_cells[1].text = heure_str
             row_cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
             
-            # Calculer la durée
-            h_debut = seance['h_debut']
-            h_fin = seance['h_fin']
-            # Convertir en minutes pour calculer la durée
-            debut_minutes = h_debut.hour * 60 + h_debut.minute
-            fin_minutes = h_fin.hour * 60 + h_fin.minute
-            duree_minutes = fin_minutes - debut_minutes
-            
-            # Formater la durée (ex: "2h00" ou "1h30")
-            heures = duree_minutes // 60
-            minutes = duree_minutes % 60
-            if minutes > 0:
-                duree_str = f"{heures}h{minutes:02d}"
-            else:
-                duree_str = f"{heures}h00"
-            
             # Durée
             self._set_cell_vertical_alignment(row_cells[2], 'center')
             row_cells[2].text = duree_str
             row_cells[2].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            ligne_modele = row_cells[0]._element.getparent()
         
         doc.add_paragraph()
         
@@ -391,12 +646,112 @@ class ExportService:
         # Sauvegarder
         doc.save(filepath)
     
+    def _ecrire_convocation_pdf(self, nom: str, prenom: str, seances_list: List[dict], filepath: str):
+        """Construit la convocation directement en PDF (reportlab), même contenu que la version Word"""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+        from reportlab.lib import colors
+        bleu = colors.HexColor('#003399')
+        marge = 0.5 * inch
+        largeur_page, hauteur_page = A4
+        
+        # En-tête ISI et pied de page dessinés sur chaque page, comme dans Word
+        entete = self._entete_pdf()
+        _, hauteur_entete = entete.wrap(largeur_page - 2 * marge, hauteur_page)
+        
+        def dessiner_entete_pied(c, doc):
+            c.saveState()
+            entete.drawOn(c, marge, hauteur_page - marge - hauteur_entete)
+            
+            # Ligne de séparation bleue puis adresse, email en bleu souligné
+            c.setStrokeColor(bleu)
+            c.setLineWidth(1.5)
+            c.line(marge, marge + 14, largeur_page - marge, marge + 14)
+            adresse = "02 Rue Abou Raihane Bayrouni 2080 Ariana   Tél :71706164   Email : "
+            email = "ISI@isi.rnu.tn"
+            largeur_adresse = c.stringWidth(adresse, 'Helvetica', 8)
+            largeur_email = c.stringWidth(email, 'Helvetica', 8)
+            x = (largeur_page - largeur_adresse - largeur_email) / 2
+            c.setFont('Helvetica', 8)
+            c.drawString(x, marge + 2, adresse)
+            c.setFillColor(colors.HexColor('#0033cc'))
+            c.setStrokeColor(colors.HexColor('#0033cc'))
+            c.setLineWidth(0.5)
+            c.drawString(x + largeur_adresse, marge + 2, email)
+            c.line(x + largeur_adresse, marge + 1, x + largeur_adresse + largeur_email, marge + 1)
+            c.restoreState()
+        
+        doc = SimpleDocTemplate(
+            filepath,
+            pagesize=A4,
+            leftMargin=marge,
+            rightMargin=marge,
+            topMargin=marge + hauteur_entete + 12,
+            bottomMargin=marge + 24
+        )
+        
+        styles = _styles_pdf()
+        
+        # Tableau des surveillances simplifié : Date | Heure | Durée
+        table = Table(
+            [['Date', 'Heure', 'Durée']] + self._lignes_convocation(seances_list),
+            colWidths=[2.5 * inch, 2.0 * inch, 2.0 * inch],
+            repeatRows=1
+        )
+        table.setStyle(styles['tableau'])
+        
+        elements = [
+            Spacer(1, 14),
+            Paragraph('Notes à', styles['note']),
+            Paragraph(escape(f'M./Mme {nom} {prenom}'), styles['nom']),
+            Spacer(1, 14),
+            Paragraph('Cher(e) Collègue,', styles['texte']),
+            Spacer(1, 14),
+            Paragraph(
+                "Vous êtes prié(e) d'assurer la surveillance et (ou) la responsabilité des examens "
+                "selon le calendrier ci-joint.",
+                styles['texte']
+            ),
+            Spacer(1, 14),
+            table,
+        ]
+        
+        doc.build(elements, onFirstPage=dessiner_entete_pied, onLaterPages=dessiner_entete_pied)
+    
+    def _entete_pdf(self) -> "Table":
+        """Tableau d'en-tête ISI (logo, titres, référence) pour les documents PDF"""
+        from reportlab.lib.units import inch
+        from reportlab.platypus import Table, Paragraph, Image
+        styles = _styles_pdf()
+        
+        logo = Image(
+            get_resource_path(os.path.join('logo', 'logoISI.png')),
+            width=1.2 * inch, height=1.2 * inch, kind='proportional'
+        )
+        
+        entete = Table(
+            [
+                [logo, Paragraph("GESTION DES EXAMENS ET DÉLIBÉRATIONS", styles['entete_titre']),
+                 Paragraph("EXD-FR-08-01", styles['entete_ref'])],
+                ['', Paragraph("Procédure d'exécution des épreuves", styles['entete_titre']),
+                 Paragraph("Date d'approbation<br/>0504-24", styles['entete_ref'])],
+                ['', Paragraph("Liste d'affectation des surveillants", styles['entete_liste']),
+                 Paragraph("Page 1/1", styles['entete_ref'])],
+            ],
+            colWidths=[1.5 * inch, 4.2 * inch, 1.5 * inch]
+        )
+        entete.setStyle(styles['entete'])
+        return entete
+    
     def generer_listes_par_creneau(self) -> List[str]:
         """Génère les listes de surveillants par créneau (Word) - Un fichier par jour avec toutes les séances"""
         filepaths = []
         
-        # Récupérer tous les examens
-        examens = self.db.query(Examen).order_by(
+        # Récupérer tous les examens, avec leurs affectations et enseignants
+        examens = self.db.query(Examen).options(
+            selectinload(Examen.affectations).joinedload(Affectation.enseignant)
+        ).order_by(
             Examen.dateExam, Examen.h_debut
         ).all()
         
@@ -419,27 +774,23 @@ class ExportService:
             filepath = os.path.join(self.export_dir, filename)
             
             # Créer un document avec toutes les séances du jour
-            doc = Document()
-            
-            # Ajouter l'en-tête au document
-            self._ajouter_entete(doc)
-            
-            # Ajouter le pied de page au document
-            self._ajouter_pied_de_page(doc)
+            # (en-tête et pied de page ISI déjà présents)
+            doc = _nouveau_document()
             
             # Trier les créneaux par heure de début
             creneaux_tries = sorted(creneaux.items(), key=lambda x: x[0][0])
             
+            lignes_differees = []
             for idx, ((h_debut, h_fin), liste_examens) in enumerate(creneaux_tries):
                 # Ajouter le contenu de la séance
-                self._ajouter_seance_au_document(doc, date_exam, h_debut, h_fin, liste_examens)
+                self._ajouter_seance_au_document(doc, date_exam, h_debut, h_fin, liste_examens, lignes_differees)
                 
                 # Ajouter un saut de page entre les séances (chaque séance sur sa propre page)
                 if idx < len(creneaux_tries) - 1:
                     doc.add_page_break()
             
             # Sauvegarder le document
-            doc.save(filepath)
+            self._enregistrer_docx(doc, filepath, lignes_differees)
             filepaths.append(filepath)
         
         logger.info(f"✅ {len(filepaths)} fichiers générés (un par jour)")
@@ -447,27 +798,42 @@ class ExportService:
     
     def _ajouter_seance_au_document(
         self, 
-        doc: Document,
+        doc: "Document",
         date_exam: date, 
         h_debut, 
         h_fin, 
-        examens: List[Examen]
+        examens: List[Examen],
+        lignes_differees: List[List[str]]
     ):
-        """Ajoute une séance à un document Word existant avec mise en forme professionnelle"""
-        from docx.oxml.ns import qn
-        from docx.oxml import OxmlElement
+        """Ajoute une séance à un document Word existant avec mise en forme professionnelle
+        
+        Les lignes des tableaux ne sont pas construites avec python-docx : les noms sont ajoutés
+        à `lignes_differees` et écrits directement en XML par _enregistrer_docx.
+        """
+        from docx.shared import Pt, RGBColor
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.oxml import parse_xml
+        from lxml import etree
         
         # Pour chaque groupe (même session/semestre) dans ce créneau
-        # Regrouper les examens par session et semestre
+        # Regrouper les examens par session et semestre et, dans le même parcours,
+        # récupérer les enseignants affectés au groupe
+        # (dictionnaire indexé par id : dédoublonnage en O(1) au lieu d'un parcours de la liste)
         groupes = {}
         for examen in examens:
-            cle = (examen.session, examen.semestre)
-            if cle not in groupes:
-                groupes[cle] = []
-            groupes[cle].append(examen)
+            enseignants_groupe = groupes.setdefault((examen.session, examen.semestre), {})
+            # Affectations chargées avec les examens par l'appelant (selectinload)
+            for aff in examen.affectations:
+                # Éviter les doublons
+                if aff.enseignant_id not in enseignants_groupe:
+                    enseignants_groupe[aff.enseignant_id] = {
+                        'id': aff.enseignant.id,
+                        'nom': aff.enseignant.nom,
+                        'prenom': aff.enseignant.prenom
+                    }
         
         # Générer un tableau pour chaque groupe session/semestre
-        for (session, semestre), examens_groupe in groupes.items():
+        for (session, semestre), enseignants_affectes in groupes.items():
             # Convertir le code de session en texte complet
             session_text = self._convertir_session(session)
             
@@ -499,109 +865,63 @@ class ExportService:
             p_date.space_after = Pt(12)
             
             # === TABLEAU DES SURVEILLANTS ===
-            # Récupérer tous les enseignants affectés à ce créneau
-            enseignants_affectes = []
-            for examen in examens_groupe:
-                affectations = self.db.query(Affectation).options(
-                    joinedload(Affectation.enseignant)
-                ).filter(
-                    Affectation.examen_id == examen.id
-                ).all()
-                
-                for aff in affectations:
-                    # Éviter les doublons
-                    if not any(e['id'] == aff.enseignant.id for e in enseignants_affectes):
-                        enseignants_affectes.append({
-                            'id': aff.enseignant.id,
-                            'nom': aff.enseignant.nom,
-                            'prenom': aff.enseignant.prenom
-                        })
-            
             # Créer le tableau avec 3 colonnes : Enseignant | Salle | Signature
             if enseignants_affectes:
-                table = doc.add_table(rows=1, cols=3)
-                table.style = 'Table Grid'
-                
-                # Définir les largeurs de colonnes (ajustées pour tenir dans la page)
-                table.autofit = False
-                table.allow_autofit = False
-                
-                # Largeur totale disponible : environ 7 pouces (marges de 0.5" de chaque côté)
-                for row in table.rows:
-                    row.cells[0].width = Inches(3.5)   # Enseignant (50%)
-                    row.cells[1].width = Inches(1.75)  # Salle (25%)
-                    row.cells[2].width = Inches(1.75)  # Signature (25%)
-                
-                # Définir la largeur totale du tableau
-                from docx.oxml import OxmlElement
-                from docx.oxml.ns import qn
-                tbl = table._element
-                tblPr = tbl.tblPr
-                if tblPr is None:
-                    tblPr = OxmlElement('w:tblPr')
-                    tbl.insert(0, tblPr)
+                # Tableau mis en forme (propriétés, grille, en-tête) créé d'un bloc depuis son modèle XML
+                tbl = parse_xml(TABLEAU_SEANCE_XML)
+                p_date._p.addnext(tbl)
                 
-                # Définir la largeur du tableau en pourcentage
-                tblW = OxmlElement('w:tblW')
-                tblW.set(qn('w:w'), '5000')  # 100% de la largeur disponible
-                tblW.set(qn('w:type'), 'pct')
-                tblPr.append(tblW)
-                
-                # En-têtes avec style
-                hdr_cells = table.rows[0].cells
-                for i, header_text in enumerate(['Enseignant', 'Salle', 'Signature']):
-                    cell = hdr_cells[i]
-                    cell.paragraphs[0].clear()
-                    self._set_cell_vertical_alignment(cell, 'center')
-                    p = cell.paragraphs[0]
-                    run = p.add_run(header_text)
-                    run.font.bold = True
-                    run.font.size = Pt(11)
-                    run.font.color.rgb = RGBColor(255, 255, 255)  # Texte blanc
-                    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    
-                    # Fond bleu vif pour l'en-tête
-                    self._set_cell_background(cell, "003399")  # Bleu plus vif et saturé
-                
-                # Ajouter chaque enseignant
-                for ens in sorted(enseignants_affectes, key=lambda x: (x['nom'], x['prenom'])):
-                    row_cells = table.add_row().cells
-                    
-                    # Définir la hauteur de ligne compacte
-                    from docx.oxml import OxmlElement
-                    from docx.oxml.ns import qn
-                    
-                    tr = row_cells[0]._element.getparent()
-                    trPr = tr.get_or_add_trPr()
-                    trHeight = OxmlElement('w:trHeight')
-                    # Hauteur fixe de 300 twips (environ 0.53 cm) - compact mais lisible
-                    trHeight.set(qn('w:val'), '300')
-                    trHeight.set(qn('w:hRule'), 'exact')  # Hauteur exacte
-                    trPr.append(trHeight)
-                    
-                    # Nom de l'enseignant
-                    self._set_cell_vertical_alignment(row_cells[0], 'center')
-                    row_cells[0].text = f"{ens['nom']} {ens['prenom']}"
-                    row_cells[0].paragraphs[0].runs[0].font.size = Pt(8)  # Police plus petite
-                    row_cells[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.LEFT
-                    
-                    # Salle (vide)
-                    self._set_cell_vertical_alignment(row_cells[1], 'center')
-                    row_cells[1].text = ''
-                    
-                    # Signature (vide)
-                    self._set_cell_vertical_alignment(row_cells[2], 'center')
-                    row_cells[2].text = ''
-                    
-                    # Aucun espacement pour maximiser l'espace
-                    for cell in row_cells:
-                        cell.paragraphs[0].space_after = Pt(0)
-                        cell.paragraphs[0].space_before = Pt(0)
+                # Une ligne par enseignant, écrite à l'enregistrement depuis le modèle LIGNE_SEANCE_XML :
+                # un repère dans le tableau, les noms dans lignes_differees
+                tbl.append(etree.Comment(f"{REPERE_LIGNES}{len(lignes_differees)}"))
+                lignes_differees.append([
+                    f"{ens['nom']} {ens['prenom']}"
+                    for ens in sorted(enseignants_affectes.values(), key=lambda x: (x['nom'], x['prenom']))
+                ])
             else:
                 doc.add_paragraph("⚠️ Aucun surveillant affecté", style='Intense Quote')
             
             # Ne rien ajouter ici - le pied de page sera ajouté via la section footer du document
     
+    @staticmethod
+    def _ajouter_ligne_copiee(table, ligne_modele, textes):
+        """Ajoute à la fin du tableau une copie d'une ligne déjà mise en forme
+        
+        Évite de recréer les propriétés de chaque cellule (alignement, police, hauteur)
+        et le parcours du tableau fait par python-docx à chaque add_row().
+        
+        Args:
+            table: Tableau Word
+            ligne_modele: Élément <w:tr> à copier
+            textes: Nouveau texte de chaque cellule, dans l'ordre (cellules suivantes inchangées)
+        """
+        tr = deepcopy(ligne_modele)
+        for tc, texte in zip(tr.tc_lst, textes):
+            tc.xpath('./w:p/w:r')[0].text = texte
+        table._tbl.append(tr)
+    
+    @staticmethod
+    def _enregistrer_docx(doc: "Document", filepath: str, lignes_differees: List[List[str]]):
+        """Enregistre le document en écrivant les lignes différées directement dans word/document.xml
+        
+        Args:
+            doc: Document Word contenant les repères de lignes différées
+            filepath: Chemin du fichier .docx à produire
+            lignes_differees: Noms des lignes de chaque repère, dans l'ordre des repères
+        """
+        if not lignes_differees:
+            doc.save(filepath)
+            return
+        
+        tampon = BytesIO()
+        doc.save(tampon)
+        with zipfile.ZipFile(tampon) as source, zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED) as cible:
+            for info in source.infolist():
+                contenu = source.read(info)
+                if info.filename == 'word/document.xml':
+                    contenu = _developper_lignes(contenu.decode('utf-8'), lignes_differees).encode('utf-8')
+                cible.writestr(info, contenu)
+    
     def _set_table_borders(self, table):
         """Définit les bordures d'un tableau (style simple)"""
         from docx.oxml import OxmlElement
@@ -656,6 +976,7 @@ class ExportService:
             doc: Document Word
             color_hex: Couleur de la ligne en hexadécimal (sans #)
         """
+        from docx.shared import Pt
         from docx.oxml import OxmlElement
         from docx.oxml.ns import qn
         
@@ -683,6 +1004,7 @@ class ExportService:
             section: Section du document (header ou footer)
             color_hex: Couleur de la ligne en hexadécimal (sans #)
         """
+        from docx.shared import Pt
         from docx.oxml import OxmlElement
         from docx.oxml.ns import qn
         
@@ -708,6 +1030,8 @@ class ExportService:
         Args:
             doc: Document Word
         """
+        from docx.shared import Inches, Pt, RGBColor
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
         # Accéder à la section du document
         section = doc.sections[0]
         header = section.header
@@ -833,6 +1157,8 @@ class ExportService:
         Args:
             doc: Document Word
         """
+        from docx.shared import Pt, RGBColor
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
         # Accéder à la section du document
         section = doc.sections[0]
         footer = section.footer
@@ -886,49 +1212,64 @@ class ExportService:
     
     def generer_excel_global(self, date_debut: date = None, date_fin: date = None) -> str:
         """Génère un fichier Excel avec toutes les affectations"""
+        import xlsxwriter
         filename = f"planning_excel_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         filepath = os.path.join(self.export_dir, filename)
         
-        # Récupérer les données
-        query = self.db.query(Affectation).options(
-            joinedload(Affectation.examen),
-            joinedload(Affectation.enseignant)
-        ).join(Examen)
+        # Récupérer uniquement les colonnes exportées (tuples, sans objets ORM)
+        stmt = select(
+            Examen.dateExam,
+            Examen.h_debut,
+            Examen.h_fin,
+            Affectation.cod_salle,
+            # Libellés de session et de rôle calculés par SQLite (CASE), pas ligne par ligne en Python
+            case(CONVERSIONS_SESSION, value=Examen.session, else_=Examen.session),
+            Examen.type_ex,
+            Examen.semestre,
+            Enseignant.nom,
+            Enseignant.prenom,
+            Enseignant.grade_code,
+            Enseignant.email,
+            case((Affectation.est_responsable == True, 'Responsable'), else_='Surveillant'),
+        ).select_from(Affectation).join(Examen).join(Enseignant)
         if date_debut:
-            query = query.filter(Examen.dateExam >= date_debut)
+            stmt = stmt.where(Examen.dateExam >= date_debut)
         if date_fin:
-            query = query.filter(Examen.dateExam <= date_fin)
-        
-        affectations = query.all()
-        
-        # Préparer les données
-        data = []
-        for aff in affectations:
-            examen = aff.examen
-            enseignant = aff.enseignant
-            
-            # Convertir le code de session en texte complet
-            session_text = self._convertir_session(examen.session)
-            
-            data.append({
-                'Date': examen.dateExam.strftime('%d/%m/%Y'),
-                'Horaire Début': examen.h_debut.strftime('%H:%M'),
-                'Horaire Fin': examen.h_fin.strftime('%H:%M'),
-                'Salle': aff.cod_salle,
-                'Session': session_text,
-                'Type': examen.type_ex,
-                'Semestre': examen.semestre,
-                'Enseignant': f"{enseignant.nom} {enseignant.prenom}",
-                'Grade': enseignant.grade_code,
-                'Email': enseignant.email,
-                'Rôle': "Responsable" if aff.est_responsable else "Surveillant"
-            })
-        
-        # Créer le DataFrame
-        df = pd.DataFrame(data)
-        
-        # Sauvegarder
-        df.to_excel(filepath, index=False, sheet_name='Planning')
+            stmt = stmt.where(Examen.dateExam <= date_fin)
+        # Lignes dans l'ordre chronologique, fourni par l'index ix_examen_seance (sans tri)
+        stmt = stmt.order_by(Examen.dateExam, Examen.h_debut, Examen.h_fin)
+        
+        lignes = self.db.execute(stmt).all()
+        
+        # Moteur xlsxwriter en mode constant_memory : chaque ligne est vidée sur disque
+        # dès que la suivante commence (écriture strictement séquentielle, sans cellules
+        # fusionnées), la mémoire reste stable quel que soit le nombre d'affectations
+        wb = xlsxwriter.Workbook(filepath, {'constant_memory': True})
+        ws = wb.add_worksheet('Planning')
+        
+        ws.write_row(0, 0, (
+            'Date', 'Horaire Début', 'Horaire Fin', 'Salle', 'Session', 'Type',
+            'Semestre', 'Enseignant', 'Grade', 'Email', 'Rôle'
+        ), wb.add_format({'bold': True}))
+        
+        for ligne, (date_exam, h_debut, h_fin, salle, session, type_ex, semestre,
+                    nom, prenom, grade, email, role) in enumerate(lignes, start=1):
+            # Formatage par f-strings (plus rapide que strftime, appelé pour chaque ligne)
+            ws.write_row(ligne, 0, (
+                f"{date_exam.day:02d}/{date_exam.month:02d}/{date_exam.year}",
+                f"{h_debut.hour:02d}:{h_debut.minute:02d}",
+                f"{h_fin.hour:02d}:{h_fin.minute:02d}",
+                salle,
+                session,
+                type_ex,
+                semestre,
+                f"{nom} {prenom}",
+                grade,
+                email,
+                role
+            ))
+        
+        wb.close()
         
         logger.info(f"✅ Planning Excel généré: {filepath}")
         return filepath
@@ -948,11 +1289,7 @@ class ExportService:
             raise ValueError(f"Enseignant avec l'ID {enseignant_id} introuvable")
         
         # Récupérer les affectations
-        affectations = self.db.query(Affectation).options(
-            joinedload(Affectation.examen)
-        ).filter(
-            Affectation.enseignant_id == enseignant.id
-        ).join(Examen).order_by(Examen.dateExam, Examen.h_debut).all()
+        affectations = self.db.execute(AFFECTATIONS_ENSEIGNANT, {"eid": enseignant.id}).scalars().all()
         
         if not affectations:
             raise ValueError(f"Aucune affectation trouvée pour l'enseignant {enseignant.nom} {enseignant.prenom}")
@@ -975,20 +1312,22 @@ class ExportService:
         Returns:
             Chemin du fichier Word généré
         """
-        from datetime import time as dt_time
-        
-        # Obtenir les horaires de la séance (format string "HH:MM")
+        # Obtenir les horaires de la séance (format string "HH:MM", séance validée)
         h_debut_str, h_fin_str = self._obtenir_horaires_seance(seance)
         
-        # Convertir les strings en objets time pour la requête SQL
-        h_debut_time = dt_time(*map(int, h_debut_str.split(':')))
-        h_fin_time = dt_time(*map(int, h_fin_str.split(':')))
+        # Objets time pour la requête SQL, déjà convertis au chargement du module
+        h_debut_time, h_fin_time = HEURES_SEANCES[seance.upper()]
         
-        # Récupérer les examens pour ce créneau
-        examens = self.db.query(Examen).filter(
+        # Récupérer les examens pour ce créneau, avec leurs affectations et enseignants
+        examens = self.db.query(Examen).options(
+            selectinload(Examen.affectations).joinedload(Affectation.enseignant)
+        ).filter(
             Examen.dateExam == date_exam,
             Examen.h_debut == h_debut_time,
             Examen.h_fin == h_fin_time
+        ).order_by(
+            # Ordre de l'index ix_examen_seance après ses trois colonnes d'égalité : pas de tri SQLite
+            Examen.session, Examen.semestre, Examen.id
         ).all()
         
         if not examens:
@@ -999,19 +1338,15 @@ class ExportService:
         filepath = os.path.join(self.export_dir, filename)
         
         # Créer un document
-        doc = Document()
-        
-        # Ajouter l'en-tête
-        self._ajouter_entete(doc)
-        
-        # Ajouter le pied de page
-        self._ajouter_pied_de_page(doc)
+        # Document avec l'en-tête et le pied de page ISI
+        doc = _nouveau_document()
         
         # Ajouter le contenu de la séance (utiliser les strings pour l'affichage)
-        self._ajouter_seance_au_document(doc, date_exam, h_debut_str, h_fin_str, examens)
+        lignes_differees = []
+        self._ajouter_seance_au_document(doc, date_exam, h_debut_str, h_fin_str, examens, lignes_differees)
         
         # Sauvegarder le document
-        doc.save(filepath)
+        self._enregistrer_docx(doc, filepath, lignes_differees)
         
         logger.info(f"✅ Liste générée pour la séance {seance.upper()} du {date_exam}: {filepath}")
         return filepath
@@ -1027,62 +1362,90 @@ class ExportService:
         Returns:
             Chemin du fichier PDF généré
         """
-        pdf_path = docx_path.replace('.docx', '.pdf')
+        from docx2pdf import convert
+        pdf_path = os.path.splitext(docx_path)[0] + '.pdf'
         try:
             convert(docx_path, pdf_path)
             # Supprimer le fichier DOCX temporaire
-            if os.path.exists(docx_path):
+            try:
                 os.remove(docx_path)
+            except FileNotFoundError:
+                pass
             return pdf_path
         except Exception as e:
             logger.error(f"Erreur lors de la conversion DOCX -> PDF: {str(e)}")
             raise
     
-    def generer_convocations_individuelles_pdf(self) -> List[str]:
-        """Génère les convocations individuelles en PDF pour chaque enseignant"""
-        filepaths = []
+    def _convertir_docx_vers_pdf_lot(self, docx_paths: List[str]) -> List[str]:
+        """Convertit plusieurs fichiers DOCX en PDF en un seul appel à docx2pdf
         
-        enseignants = self.db.query(Enseignant).all()
+        Les fichiers sont regroupés dans un dossier temporaire converti d'un bloc :
+        Word (ou l'automatisation macOS) n'est démarré qu'une fois pour tout le lot.
         
-        for enseignant in enseignants:
-            # Récupérer les affectations
-            affectations = self.db.query(Affectation).options(
-                joinedload(Affectation.examen)
-            ).filter(
-                Affectation.enseignant_id == enseignant.id
-            ).join(Examen).order_by(Examen.dateExam, Examen.h_debut).all()
-            
-            if not affectations:
-                continue
-            
-            # Générer DOCX d'abord
-            filename_docx = f"convocation_{enseignant.nom}_{enseignant.prenom}_{datetime.now().strftime('%Y%m%d')}.docx"
-            filepath_docx = os.path.join(self.export_dir, filename_docx)
-            self._generer_convocation_word(enseignant, affectations, filepath_docx)
+        Args:
+            docx_paths: Chemins des fichiers DOCX (dans le dossier d'export)
             
-            # Convertir en PDF
-            filepath_pdf = self._convertir_docx_vers_pdf(filepath_docx)
-            filepaths.append(filepath_pdf)
+        Returns:
+            Chemins des fichiers PDF effectivement générés
+        """
+        from docx2pdf import convert
+        if not docx_paths:
+            return []
+        
+        pdf_paths = {docx_path: os.path.splitext(docx_path)[0] + '.pdf' for docx_path in docx_paths}
+        
+        # Supprimer les PDF d'un export précédent (mêmes noms) : seul un PDF écrit
+        # par cette conversion doit être retourné
+        for pdf_path in pdf_paths.values():
+            try:
+                os.remove(pdf_path)
+            except FileNotFoundError:
+                pass
+        
+        dossier_lot = tempfile.mkdtemp(prefix="lot_pdf_", dir=self.export_dir)
+        try:
+            for docx_path in docx_paths:
+                shutil.move(docx_path, os.path.join(dossier_lot, os.path.basename(docx_path)))
+            try:
+                convert(dossier_lot, self.export_dir)
+            except Exception as e:
+                logger.error(f"Erreur lors de la conversion DOCX -> PDF du lot: {str(e)}")
+        finally:
+            # Supprimer les DOCX convertis ; remettre dans le dossier d'export ceux
+            # dont le PDF n'a pas été produit (conservés, comme avec _convertir_docx_vers_pdf)
+            for docx_path, pdf_path in pdf_paths.items():
+                docx_lot = os.path.join(dossier_lot, os.path.basename(docx_path))
+                if not os.path.exists(docx_lot):
+                    continue
+                if os.path.exists(pdf_path):
+                    os.remove(docx_lot)
+                else:
+                    shutil.move(docx_lot, docx_path)
+            shutil.rmtree(dossier_lot, ignore_errors=True)
+        
+        generes = []
+        for docx_path, pdf_path in pdf_paths.items():
+            if os.path.exists(pdf_path):
+                generes.append(pdf_path)
+            else:
+                logger.error(f"Erreur lors de la conversion de {docx_path}: PDF non généré, DOCX conservé")
+        return generes
+    
+    def generer_convocations_individuelles_pdf(self) -> List[str]:
+        """Génère les convocations individuelles en PDF pour chaque enseignant"""
+        # PDF produit directement par reportlab, sans fichier Word ni conversion docx2pdf
+        filepaths = self._ecrire_convocations(self._taches_convocations('pdf'), _generer_convocation_pdf_processus)
         
         logger.info(f"✅ {len(filepaths)} convocations PDF générées")
         return filepaths
     
-
-    
     def generer_listes_par_creneau_pdf(self) -> List[str]:
         """Génère les listes de surveillants par créneau en PDF - Un fichier par jour"""
-        filepaths_pdf = []
-        
         # Générer d'abord les fichiers DOCX
         filepaths_docx = self.generer_listes_par_creneau()
         
-        # Convertir chaque DOCX en PDF
-        for docx_path in filepaths_docx:
-            try:
-                pdf_path = self._convertir_docx_vers_pdf(docx_path)
-                filepaths_pdf.append(pdf_path)
-            except Exception as e:
-                logger.error(f"Erreur lors de la conversion de {docx_path}: {str(e)}")
+        # Convertir tous les DOCX en PDF en un seul lot
+        filepaths_pdf = self._convertir_docx_vers_pdf_lot(filepaths_docx)
         
         logger.info(f"✅ {len(filepaths_pdf)} fichiers PDF générés (un par jour)")
         return filepaths_pdf
@@ -1091,11 +1454,19 @@ class ExportService:
     
     def generer_convocation_enseignant_pdf(self, enseignant_id: int) -> str:
         """Génère la convocation PDF pour un enseignant spécifique"""
-        # Générer d'abord le DOCX
-        filepath_docx = self.generer_convocation_enseignant(enseignant_id)
+        enseignant = self.db.query(Enseignant).filter(Enseignant.id == enseignant_id).first()
+        if not enseignant:
+            raise ValueError(f"Enseignant avec l'ID {enseignant_id} introuvable")
         
-        # Convertir en PDF
-        filepath_pdf = self._convertir_docx_vers_pdf(filepath_docx)
+        affectations = self.db.execute(AFFECTATIONS_ENSEIGNANT, {"eid": enseignant.id}).scalars().all()
+        if not affectations:
+            raise ValueError(f"Aucune affectation trouvée pour l'enseignant {enseignant.nom} {enseignant.prenom}")
+        
+        # PDF produit directement par reportlab, sans fichier Word ni conversion docx2pdf
+        filepath_pdf = os.path.join(self.export_dir, f"convocation_{enseignant.nom}_{enseignant.prenom}.pdf")
+        self._ecrire_convocation_pdf(
+            enseignant.nom, enseignant.prenom, self._seances_convocation(affectations), filepath_pdf
+        )
         
         logger.info(f"✅ Convocation PDF générée: {filepath_pdf}")
         return filepath_pdf
@@ -4,7 +4,7 @@ from models.models import Enseignant, Voeu, Examen, Affectation
 from typing import List, Dict, Tuple
 from datetime import datetime
 import logging
-from config import GRADES
+from config import GRADES_CODES, GRADES_NOMS
 
 logger = logging.getLogger(__name__)
 
@@ -87,15 +87,15 @@ class ImportService:
                     # Récupérer le code du grade et valider
                     grade_code = str(row['grade_code_ens']).strip().upper()
                     
-                    if grade_code not in GRADES:
+                    if grade_code not in GRADES_CODES:
                         erreurs.append(
                             f"Ligne {idx + 2}: Grade '{grade_code}' invalide. "
-                            f"Valeurs acceptées: {', '.join(GRADES.keys())}"
+                            f"Valeurs acceptées: {', '.join(GRADES_NOMS)}"
                         )
                         continue
                     
                     # Déduire le nom complet du grade depuis le code
-                    grade_nom = GRADES[grade_code]["nom"]
+                    grade_nom = GRADES_NOMS[grade_code]
                     
                     # Gérer participe_surveillance (vrai/faux ou True/False)
                     participe = True  # Valeur par défaut